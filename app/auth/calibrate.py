@@ -0,0 +1,60 @@
+"""Pick a bcrypt cost that fits the per-login latency budget on this host.
+
+Usage:
+    python -m app.auth.calibrate [--budget-ms 250] [--samples 5]
+
+Prints the measured time for each cost and a BCRYPT_ROUNDS line for .env.
+"""
+import argparse
+import statistics
+import time
+from passlib.hash import bcrypt
+from app.config import LOGIN_HASH_BUDGET_MS
+
+MIN_ROUNDS = 4
+MAX_ROUNDS = 16
+
+
+def measure(rounds: int, samples: int) -> float:
+    """Median milliseconds to hash one password at ``rounds``."""
+    handler = bcrypt.using(rounds=rounds)
+    handler.hash("warm-up")  # Keep backend loading out of the first sample
+    timings = []
+    for _ in range(samples):
+        start = time.perf_counter()
+        handler.hash("calibration-password")
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def calibrate(budget_ms: float, samples: int) -> tuple[int, dict[int, float]]:
+    """Return the highest cost whose median hash time fits ``budget_ms``."""
+    chosen = MIN_ROUNDS
+    timings: dict[int, float] = {}
+    for rounds in range(MIN_ROUNDS, MAX_ROUNDS + 1):
+        timings[rounds] = measure(rounds, samples)
+        if timings[rounds] > budget_ms:
+            break
+        chosen = rounds
+        # Each extra round doubles the cost, so stop once the next cannot fit
+        if timings[rounds] * 2 > budget_ms:
+            break
+    return chosen, timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--budget-ms", type=float, default=LOGIN_HASH_BUDGET_MS)
+    parser.add_argument("--samples", type=int, default=5)
+    args = parser.parse_args()
+
+    chosen, timings = calibrate(args.budget_ms, args.samples)
+    for rounds, ms in timings.items():
+        print(f"rounds={rounds:<2} {ms:8.1f} ms")
+    if timings[chosen] > args.budget_ms:
+        print(f"warning: even the minimum cost exceeds {args.budget_ms:.0f} ms")
+    print(f"BCRYPT_ROUNDS={chosen}")
+
+
+if __name__ == "__main__":
+    main()
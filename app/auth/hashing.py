@@ -0,0 +1,92 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, TypeVar
+from fastapi import HTTPException, status
+from passlib.context import CryptContext
+from app.config import PASSWORD_HASH_WORKERS, PASSWORD_HASH_QUEUE_TIMEOUT, BCRYPT_ROUNDS
+
+T = TypeVar("T")
+
+
+class PasswordHasher:
+    """Runs bcrypt work on a bounded thread pool.
+
+    bcrypt releases the GIL while hashing, so threads give real parallelism
+    without blocking the event loop. At most ``max_workers`` calls run at once;
+    a caller that cannot get a slot within ``queue_timeout`` seconds gets a 503
+    instead of piling up behind a login burst.
+    """
+
+    def __init__(
+        self, context: CryptContext, max_workers: int, queue_timeout: float
+    ):
+        self.context = context
+        self.max_workers = max_workers
+        self.queue_timeout = queue_timeout
+        self._executor: ThreadPoolExecutor | None = None
+        self._slots: asyncio.Semaphore | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    def _get_slots(self) -> asyncio.Semaphore:
+        # asyncio primitives are bound to a single loop, so recreate on change
+        loop = asyncio.get_running_loop()
+        if self._slots is None or self._loop is not loop:
+            self._slots = asyncio.Semaphore(self.max_workers)
+            self._loop = loop
+        return self._slots
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="password-hash"
+            )
+        return self._executor
+
+    async def run(self, func: Callable[..., T], *args) -> T:
+        slots = self._get_slots()
+        try:
+            await asyncio.wait_for(slots.acquire(), timeout=self.queue_timeout)
+        except asyncio.TimeoutError:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Server is busy, please try again",
+                headers={"Retry-After": "1"},
+            )
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), func, *args)
+        finally:
+            slots.release()
+
+    async def hash(self, password: str) -> str:
+        return await self.run(self.context.hash, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await self.run(self.context.verify, plain_password, hashed_password)
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+
+def build_context(rounds: int | None = None) -> CryptContext:
+    if rounds is None:
+        return CryptContext(schemes=["bcrypt"], deprecated="auto")
+    # Pinning min and max makes needs_update flag any hash with a different cost
+    return CryptContext(
+        schemes=["bcrypt"],
+        deprecated="auto",
+        bcrypt__default_rounds=rounds,
+        bcrypt__min_rounds=rounds,
+        bcrypt__max_rounds=rounds,
+    )
+
+
+pwd_context = build_context(BCRYPT_ROUNDS)
+
+password_hasher = PasswordHasher(
+    pwd_context,
+    max_workers=PASSWORD_HASH_WORKERS,
+    queue_timeout=PASSWORD_HASH_QUEUE_TIMEOUT,
+)
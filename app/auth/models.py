@@ -1,14 +1,14 @@
-import uuid
-from sqlalchemy import Column, String
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, DateTime, String
 from sqlalchemy.orm import relationship
 from app.database import Base
+from app.ids import new_id
+from app.types import GUID
 
 
 class User(Base):
     __tablename__ = "users"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(GUID(), primary_key=True, default=new_id)
     username = Column(String, unique=True)
     hashed_password = Column(String)
 
@@ -19,3 +19,12 @@ class User(Base):
         "Project", back_populates="user", cascade="all, delete-orphan"
     )
     tasks = relationship("Task", back_populates="user", cascade="all, delete-orphan")
+
+
+class RevokedToken(Base):
+    __tablename__ = "revoked_tokens"
+
+    # A token's jti, or the sid of a logged-out session (all of its tokens)
+    jti = Column(String, primary_key=True)
+    expires_at = Column(DateTime, nullable=False, index=True)
+    revoked_at = Column(DateTime, nullable=False, index=True)
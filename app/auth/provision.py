@@ -0,0 +1,117 @@
+"""Bulk-provision user accounts from a stream of JSON lines.
+
+Usage:
+    python -m app.auth.provision users.jsonl [--chunk-size 500] [--workers N]
+    cat users.jsonl | python -m app.auth.provision -
+
+Each input line is {"username": ..., "password": ...}. Passwords are hashed
+across a process pool, and each chunk is inserted with a single executemany
+in its own transaction. One JSON result per input line is written to stdout:
+status is "created", "exists", "duplicate" (repeated earlier in the input) or
+"invalid".
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import AsyncIterator, Iterable
+from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.auth.schemas import UserCreate
+from app.auth.services import hash_password, insert_users
+
+
+def parse_line(line: str) -> UserCreate:
+    return UserCreate.model_validate_json(line)
+
+
+async def _flush(
+    db: AsyncSession, chunk: list[tuple[int, UserCreate]], executor: Executor
+) -> list[dict]:
+    loop = asyncio.get_running_loop()
+    hashes = await asyncio.gather(
+        *(loop.run_in_executor(executor, hash_password, u.password) for _, u in chunk)
+    )
+    rows = [
+        {"username": u.username, "hashed_password": hashed}
+        for (_, u), hashed in zip(chunk, hashes)
+    ]
+    created = await insert_users(db, rows)
+    await db.commit()
+
+    results = []
+    for line_no, user in chunk:
+        if user.username in created:
+            results.append(
+                {
+                    "line": line_no,
+                    "username": user.username,
+                    "status": "created",
+                    "id": str(created[user.username]),
+                }
+            )
+        else:
+            results.append(
+                {"line": line_no, "username": user.username, "status": "exists"}
+            )
+    return results
+
+
+async def provision(
+    db: AsyncSession,
+    lines: Iterable[str],
+    executor: Executor,
+    chunk_size: int = 500,
+) -> AsyncIterator[dict]:
+    """Provision users from ``lines`` and yield one result per non-blank line."""
+    seen: set[str] = set()
+    chunk: list[tuple[int, UserCreate]] = []
+
+    for line_no, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            user = parse_line(line)
+        except ValidationError as exc:
+            yield {"line": line_no, "status": "invalid", "detail": exc.errors()[0]["msg"]}
+            continue
+        if user.username in seen:
+            yield {"line": line_no, "username": user.username, "status": "duplicate"}
+            continue
+        seen.add(user.username)
+
+        chunk.append((line_no, user))
+        if len(chunk) >= chunk_size:
+            for result in await _flush(db, chunk, executor):
+                yield result
+            chunk = []
+
+    if chunk:
+        for result in await _flush(db, chunk, executor):
+            yield result
+
+
+async def main():
+    import app.models  # noqa: F401
+    from app.database import write_session
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("source", help="JSON-lines file, or - for stdin")
+    parser.add_argument("--chunk-size", type=int, default=500)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    source = sys.stdin if args.source == "-" else open(args.source)
+    counts: dict[str, int] = {}
+    with source, ProcessPoolExecutor(max_workers=args.workers) as executor:
+        async with write_session() as db:
+            async for result in provision(db, source, executor, args.chunk_size):
+                counts[result["status"]] = counts.get(result["status"], 0) + 1
+                print(json.dumps(result), flush=True)
+    print(json.dumps({"summary": counts}), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
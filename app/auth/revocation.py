@@ -0,0 +1,112 @@
+import hashlib
+import heapq
+import time
+from datetime import datetime
+from app.config import REVOCATION_BLOOM_BITS, REVOCATION_BLOOM_HASHES
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings; answers "definitely not" in O(k)."""
+
+    def __init__(self, num_bits: int, num_hashes: int):
+        self.num_bits = num_bits
+        self.num_hashes = num_hashes
+        self._bits = bytearray((num_bits + 7) // 8)
+
+    def _positions(self, item: str):
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.num_hashes):
+            yield (h1 + i * h2) % self.num_bits
+
+    def add(self, item: str):
+        for pos in self._positions(item):
+            self._bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, item: str) -> bool:
+        return all(
+            self._bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(item)
+        )
+
+
+class RevocationStore:
+    """In-memory set of revoked token ids (``jti``), each kept until its token expires.
+
+    Lookups are a dict probe. Expired entries are dropped lazily in expiry order.
+
+    The optional Bloom filter in front of the dict is off by default: in CPython
+    hashing the jti and probing k bits costs about ten times more than the dict
+    lookup it is meant to avoid, and it saves no memory since the dict holds
+    every jti anyway. It cannot forget items, so evicted jtis stay in it as
+    false positives (answered by the dict) until they outnumber the live ones
+    and it is rebuilt.
+    """
+
+    def __init__(self, bloom_bits: int = 0, bloom_hashes: int = 4):
+        self.bloom_bits = bloom_bits
+        self.bloom_hashes = bloom_hashes
+        self._revoked: dict[str, float] = {}
+        self._expiry_heap: list[tuple[float, str]] = []
+        self._bloom = self._new_bloom()
+        self._bloom_stale = 0  # Evicted jtis still set in the Bloom filter
+        # Bookkeeping for pulling revocations made by other workers
+        self.last_sync: float | None = None
+        self.watermark: datetime | None = None
+
+    def _new_bloom(self) -> BloomFilter | None:
+        if self.bloom_bits <= 0:
+            return None
+        return BloomFilter(self.bloom_bits, self.bloom_hashes)
+
+    def revoke(self, jti: str, expires_at: float):
+        """Revoke ``jti`` until ``expires_at`` (a Unix timestamp)."""
+        if expires_at <= time.time():
+            return
+        self._revoked[jti] = expires_at
+        heapq.heappush(self._expiry_heap, (expires_at, jti))
+        if self._bloom is not None:
+            self._bloom.add(jti)
+
+    def is_revoked(self, jti: str | None) -> bool:
+        if jti is None:
+            return False
+        self._evict_expired()
+        if self._bloom is not None and jti not in self._bloom:
+            return False
+        return jti in self._revoked
+
+    def sync_due(self, interval: float) -> bool:
+        if interval <= 0:
+            return False
+        return self.last_sync is None or time.monotonic() - self.last_sync >= interval
+
+    def _evict_expired(self):
+        now = time.time()
+        while self._expiry_heap and self._expiry_heap[0][0] <= now:
+            expires_at, jti = heapq.heappop(self._expiry_heap)
+            # A jti re-revoked with a later expiry leaves a stale heap entry behind
+            if self._revoked.get(jti) == expires_at:
+                del self._revoked[jti]
+                self._bloom_stale += 1
+        if self._bloom is not None and self._bloom_stale > len(self._revoked):
+            self._bloom = self._new_bloom()
+            for jti in self._revoked:
+                self._bloom.add(jti)
+            self._bloom_stale = 0
+
+    def clear(self):
+        self._revoked.clear()
+        self._expiry_heap.clear()
+        self._bloom = self._new_bloom()
+        self._bloom_stale = 0
+        self.last_sync = None
+        self.watermark = None
+
+    def __len__(self) -> int:
+        return len(self._revoked)
+
+
+revocation_store = RevocationStore(
+    bloom_bits=REVOCATION_BLOOM_BITS, bloom_hashes=REVOCATION_BLOOM_HASHES
+)
@@ -1,36 +1,45 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, BackgroundTasks, Cookie, Depends, Request
 from fastapi.responses import JSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi.security import OAuth2PasswordRequestForm
 from app.auth.schemas import UserRead, UserCreate
-from app.auth.services import create_user, login_user, get_current_user
+from app.auth.services import (
+    create_user,
+    login_user,
+    get_current_user,
+    revoke_token,
+    set_access_cookie,
+)
 from app.auth.models import User
-from app.database import get_db
-from app.config import JWT_EXP
+from app.database import get_read_db, get_write_db
 
 router = APIRouter()
 
 
 @router.post("/register", response_model=UserRead)
-async def register_user(user_in: UserCreate, db: AsyncSession = Depends(get_db)):
+async def register_user(
+    user_in: UserCreate, db: AsyncSession = Depends(get_write_db)
+):
     return await create_user(db, user_in)
 
 
 @router.post("/token")
 async def login_for_access_token(
-    form_data: OAuth2PasswordRequestForm = Depends(), db: AsyncSession = Depends(get_db)
+    request: Request,
+    background_tasks: BackgroundTasks,
+    form_data: OAuth2PasswordRequestForm = Depends(),
+    db: AsyncSession = Depends(get_read_db),
 ):
-    access_token = await login_user(db, form_data)
+    client_ip = request.client.host if request.client else None
+    access_token = await login_user(
+        db,
+        form_data,
+        client_ip=client_ip,
+        background_tasks=background_tasks,
+    )
 
     response = JSONResponse(content={"message": "Logged in"})
-    response.set_cookie(
-        key="access_token",
-        value=access_token,
-        httponly=True,
-        samesite="strict",  # "lax" or "strict" depending on your needs
-        max_age=JWT_EXP,
-        secure=False,  # True in production with HTTPS
-    )
+    set_access_cookie(response, access_token)
     return response
 
 
@@ -40,7 +49,12 @@ async def read_users_me(current_user: User = Depends(get_current_user)):
 
 
 @router.post("/logout")
-async def logout():
+async def logout(
+    access_token: str | None = Cookie(default=None),
+    db: AsyncSession = Depends(get_write_db),
+):
+    if access_token is not None:
+        await revoke_token(db, access_token)
     response = JSONResponse(content={"message": "Logged out successfully"})
     response.delete_cookie(
         key="access_token",
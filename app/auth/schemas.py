@@ -1,3 +1,4 @@
+from dataclasses import dataclass
 from typing import List, TYPE_CHECKING
 from pydantic import BaseModel, ConfigDict
 from uuid import UUID
@@ -26,3 +27,11 @@ class UserInDB(UserBase):
     hashed_password: str
 
     model_config = ConfigDict(from_attributes=True)
+
+
+@dataclass(frozen=True, slots=True)
+class Principal:
+    """Lightweight, session-independent view of the authenticated user."""
+
+    id: UUID
+    username: str
@@ -1,19 +1,60 @@
+import hashlib
+import time
 import uuid
 from datetime import datetime, timedelta, timezone
-from fastapi import Cookie, HTTPException, status, Depends
+from fastapi import BackgroundTasks, Cookie, HTTPException, Response, status, Depends
 from fastapi.security import OAuth2PasswordRequestForm, OAuth2PasswordBearer
 from jose import jwt, JWTError
-from passlib.context import CryptContext
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from app.config import JWT_SECRET, JWT_ALG, JWT_EXP
+from sqlalchemy import (
+    DateTime,
+    bindparam,
+    delete,
+    event,
+    func,
+    insert,
+    select,
+    type_coerce,
+    update,
+)
+from sqlalchemy.exc import IntegrityError
+from app.config import (
+    JWT_SECRET,
+    JWT_ALG,
+    JWT_EXP,
+    AUTH_PRINCIPAL_CACHE_SIZE,
+    AUTH_PRINCIPAL_CACHE_TTL,
+    AUTH_LIGHTWEIGHT_PRINCIPAL,
+    JWT_CACHE_SIZE,
+    AUTH_CLAIMS_MODE,
+    REVOCATION_SYNC_INTERVAL,
+    JWT_RENEW_FRACTION,
+    SESSION_MAX_AGE,
+    SQLITE_WRITE_TIMEOUT,
+)
 from app.auth import models, schemas
-from app.database import get_db
+from app.auth.cache import TTLCache
+from app.auth.hashing import pwd_context, password_hasher
+from app.auth.revocation import revocation_store
+from app.auth.throttle import login_throttle
+from app.database import get_read_db, run_write, write_session
+from app.ids import new_id
 
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/token")
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Principals keyed by user id, so protected requests can skip the users lookup
+principal_cache: TTLCache[schemas.Principal] = TTLCache(
+    maxsize=AUTH_PRINCIPAL_CACHE_SIZE, ttl=AUTH_PRINCIPAL_CACHE_TTL
+)
+
+# Decoded claims keyed by a digest of the raw token; each entry expires with it
+token_cache: TTLCache[dict] = TTLCache(maxsize=JWT_CACHE_SIZE, ttl=0)
+
+
+@event.listens_for(models.User, "after_delete")
+def _evict_deleted_user(mapper, connection, target):
+    principal_cache.invalidate(target.id)
 
 
 def hash_password(password: str) -> str:
@@ -26,61 +67,305 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
 
 def create_access_token(data: dict, expires_delta: timedelta | None = None):
     to_encode = data.copy()
-    expire = datetime.now(timezone.utc) + (expires_delta or timedelta(minutes=15))
-    to_encode.update({"exp": expire})
+    now = datetime.now(timezone.utc)
+    expire = now + (expires_delta or timedelta(minutes=15))
+    to_encode.update({"exp": expire, "iat": now})
+    to_encode.setdefault("jti", uuid.uuid4().hex)
+    # The session: kept by every renewal, so logout and SESSION_MAX_AGE cover
+    # all tokens descended from one login
+    to_encode.setdefault("sid", uuid.uuid4().hex)
+    to_encode.setdefault("auth_time", int(now.timestamp()))
     return jwt.encode(to_encode, JWT_SECRET, algorithm=JWT_ALG)
 
 
+def set_access_cookie(response: Response, access_token: str):
+    response.set_cookie(
+        key="access_token",
+        value=access_token,
+        httponly=True,
+        samesite="strict",  # "lax" or "strict" depending on your needs
+        max_age=JWT_EXP,
+        secure=False,  # True in production with HTTPS
+    )
+
+
+def session_end(payload: dict) -> float | None:
+    """When the token's session stops renewing, or None if it never does."""
+    if SESSION_MAX_AGE <= 0:
+        return None
+    return payload["auth_time"] + SESSION_MAX_AGE
+
+
+def renew_access_token(payload: dict) -> str | None:
+    """Reissue a token past the renewal threshold, keeping its other claims.
+
+    The new token keeps the session's ``sid`` and ``auth_time`` and never
+    outlives the session. Returns None while the token is still fresh, once
+    the session has reached SESSION_MAX_AGE, or if the token lacks the claims
+    to tell (iat/exp/sid/auth_time).
+    """
+    iat, exp = payload.get("iat"), payload.get("exp")
+    if JWT_RENEW_FRACTION <= 0 or iat is None or exp is None:
+        return None
+    if "sid" not in payload or "auth_time" not in payload:
+        return None
+    now = time.time()
+    if now < iat + (exp - iat) * JWT_RENEW_FRACTION:
+        return None
+    lifetime = timedelta(minutes=JWT_EXP)
+    end = session_end(payload)
+    if end is not None:
+        if end <= now:
+            return None
+        lifetime = min(lifetime, timedelta(seconds=end - now))
+    claims = {k: v for k, v in payload.items() if k not in ("exp", "iat", "jti")}
+    return create_access_token(claims, expires_delta=lifetime)
+
+
+def decode_access_token(token: str) -> dict:
+    """Verify a token and return its claims, reusing earlier verifications.
+
+    Raises JWTError for invalid or expired tokens, just like jwt.decode.
+    """
+    key = hashlib.sha256(token.encode()).digest()
+    payload = token_cache.get(key)
+    if payload is not None:
+        return payload
+
+    payload = jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALG])
+    exp = payload.get("exp")
+    if exp is not None:
+        # The cache clock is monotonic, so convert exp to a remaining lifetime
+        remaining = exp - time.time()
+        if remaining > 0:
+            token_cache.set(key, payload, ttl=remaining)
+    return payload
+
+
+def _dialect_insert(db: AsyncSession, model):
+    """INSERT construct with ON CONFLICT support for the session's backend."""
+    if db.bind.dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    return dialect_insert(model)
+
+
+def _utcnow() -> datetime:
+    # DateTime columns hold naive UTC
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def _db_utcnow(db: AsyncSession):
+    """The database's clock as naive UTC, read when the statement runs.
+
+    Unlike ``_utcnow()`` bound as a parameter, this can't be stamped before a
+    write has waited for the writer connection, and every worker shares it.
+    """
+    if db.bind.dialect.name == "postgresql":
+        now = func.timezone("UTC", func.clock_timestamp())
+    else:
+        now = func.strftime("%Y-%m-%d %H:%M:%f", "now")
+    return type_coerce(now, DateTime)
+
+
+# How far each revocation pull reaches back before the previous one. A
+# revocation is stamped when its INSERT runs but only becomes visible at
+# commit, which can be a whole group-commit batch or write timeout later.
+REVOCATION_SYNC_OVERLAP = timedelta(seconds=SQLITE_WRITE_TIMEOUT + 5)
+
+
+async def revoke_token(db: AsyncSession, token: str):
+    """Revoke a token and every other token of its session. Invalid tokens are ignored.
+
+    The jti is revoked until the token expires. The sid is revoked for one
+    token lifetime: every token of the session was issued before now, and
+    none can be renewed from here on, so by then they have all expired.
+    """
+    try:
+        payload = decode_access_token(token)
+    except JWTError:
+        return
+    jti, exp = payload.get("jti"), payload.get("exp")
+    if jti is None or exp is None:
+        return
+    revoked = {jti: exp}
+    if payload.get("sid") is not None:
+        revoked[payload["sid"]] = time.time() + timedelta(minutes=JWT_EXP).total_seconds()
+
+    async def op(session: AsyncSession):
+        await session.execute(
+            _dialect_insert(session, models.RevokedToken)
+            .values(
+                jti=bindparam("jti"),
+                expires_at=bindparam("expires_at"),
+                revoked_at=_db_utcnow(session),
+            )
+            .on_conflict_do_nothing(index_elements=["jti"]),
+            [
+                {
+                    "jti": key,
+                    "expires_at": datetime.fromtimestamp(
+                        expires, timezone.utc
+                    ).replace(tzinfo=None),
+                }
+                for key, expires in revoked.items()
+            ],
+        )
+
+    await run_write(db, op)
+    for key, expires in revoked.items():
+        revocation_store.revoke(key, expires)
+
+
+async def load_revocations(db: AsyncSession):
+    """Pull unexpired revocations into memory.
+
+    The first call loads everything; later calls only fetch rows revoked since
+    shortly before the previous pull, which is how other workers' logouts
+    become visible.
+    """
+    started = await db.scalar(select(_db_utcnow(db)))
+    stmt = select(models.RevokedToken.jti, models.RevokedToken.expires_at).where(
+        models.RevokedToken.expires_at > started
+    )
+    if revocation_store.watermark is not None:
+        stmt = stmt.where(models.RevokedToken.revoked_at >= revocation_store.watermark)
+    result = await db.execute(stmt)
+    for jti, expires_at in result.all():
+        revocation_store.revoke(jti, expires_at.replace(tzinfo=timezone.utc).timestamp())
+
+    revocation_store.watermark = started - REVOCATION_SYNC_OVERLAP
+    revocation_store.last_sync = time.monotonic()
+
+
+async def purge_expired_revocations(db: AsyncSession):
+    await db.execute(
+        delete(models.RevokedToken).where(models.RevokedToken.expires_at <= _utcnow())
+    )
+    await db.commit()
+
+
+def build_token_claims(user: models.User) -> dict:
+    claims = {"sub": str(user.id)}
+    if AUTH_CLAIMS_MODE:
+        claims["username"] = user.username
+    return claims
+
+
 async def create_user(
     db: AsyncSession, user_in: schemas.UserCreate
 ) -> schemas.UserRead:
-    # check if username already exists
-    result = await db.execute(
-        select(models.User).where(models.User.username == user_in.username)
-    )
-    existing = result.scalar_one_or_none()
-    if existing:
+    # One INSERT ... RETURNING; the unique constraint on username catches duplicates
+    hashed_password = await password_hasher.hash(user_in.password)
+
+    async def op(session: AsyncSession):
+        return await session.scalar(
+            insert(models.User)
+            .values(
+                id=new_id(),
+                username=user_in.username,
+                hashed_password=hashed_password,
+            )
+            .returning(models.User)
+        )
+
+    try:
+        db_user = await run_write(db, op)
+    except IntegrityError:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Username already registered",
         )
+    principal_cache.invalidate(db_user.id)
+
+    return db_user
+
 
-    # create user with hashed password
-    db_user = models.User(
-        id=uuid.uuid4(),
-        username=user_in.username,
-        hashed_password=hash_password(user_in.password),
+async def insert_users(db: AsyncSession, rows: list[dict]) -> dict[str, uuid.UUID]:
+    """Insert pre-hashed users with one executemany, skipping taken usernames.
+
+    Each row needs ``username`` and ``hashed_password``. Returns the id of every
+    user that was created, keyed by username. The caller owns the transaction.
+    """
+    if not rows:
+        return {}
+    stmt = (
+        _dialect_insert(db, models.User)
+        .on_conflict_do_nothing(index_elements=["username"])
+        .returning(models.User.id, models.User.username)
     )
-    db.add(db_user)
-    await db.commit()
-    await db.refresh(db_user)
+    result = await db.execute(stmt, [{"id": new_id(), **row} for row in rows])
+    created = {username: user_id for user_id, username in result.all()}
+    for user_id in created.values():
+        principal_cache.invalidate(user_id)
+    return created
+
+
+async def rehash_password(user_id: uuid.UUID, password: str, old_hash: str):
+    """Store a hash made with the current bcrypt cost.
+
+    The update only applies if the stored hash is still ``old_hash``, so a
+    concurrent password change is never overwritten. This runs as a background
+    task after the response has gone out, when the request's sessions are
+    already closed, so it opens its own.
+    """
+    new_hash = await password_hasher.hash(password)
+
+    async def op(session: AsyncSession):
+        await session.execute(
+            update(models.User)
+            .where(models.User.id == user_id, models.User.hashed_password == old_hash)
+            .values(hashed_password=new_hash)
+        )
+
+    async with write_session() as session:
+        await run_write(session, op)
 
-    return db_user
 
+async def login_user(
+    db: AsyncSession,
+    form_data: OAuth2PasswordRequestForm,
+    client_ip: str | None = None,
+    background_tasks: BackgroundTasks | None = None,
+):
+    # Reject throttled attempts before touching SQLite or bcrypt
+    login_throttle.check(form_data.username, client_ip)
 
-async def login_user(db: AsyncSession, form_data: OAuth2PasswordRequestForm):
     result = await db.execute(
         select(models.User).where(models.User.username == form_data.username)
     )
     user = result.scalar_one_or_none()
 
-    if not user or not verify_password(form_data.password, user.hashed_password):
+    if not user or not await password_hasher.verify(
+        form_data.password, user.hashed_password
+    ):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
 
+    if background_tasks is not None and pwd_context.needs_update(user.hashed_password):
+        background_tasks.add_task(
+            rehash_password,
+            user.id,
+            form_data.password,
+            user.hashed_password,
+        )
+
     access_token_expires = timedelta(minutes=JWT_EXP)
     access_token = create_access_token(
-        data={"sub": str(user.id)}, expires_delta=access_token_expires
+        data=build_token_claims(user), expires_delta=access_token_expires
     )
     return access_token
 
 
 async def get_current_user(
-    access_token: str | None = Cookie(default=None), db: AsyncSession = Depends(get_db)
-) -> models.User:
+    access_token: str | None = Cookie(default=None),
+    db: AsyncSession = Depends(get_read_db),
+    response: Response = None,
+) -> models.User | schemas.Principal:
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -91,16 +376,41 @@ async def get_current_user(
         raise credentials_exception
 
     try:
-        payload = jwt.decode(access_token, JWT_SECRET, algorithms=[JWT_ALG])
+        payload = decode_access_token(access_token)
         user_id: uuid.UUID = uuid.UUID(payload.get("sub"))
         if user_id is None:
             raise credentials_exception
     except JWTError:
         raise credentials_exception
 
+    if revocation_store.sync_due(REVOCATION_SYNC_INTERVAL):
+        await load_revocations(db)
+    if revocation_store.is_revoked(payload.get("jti")) or revocation_store.is_revoked(
+        payload.get("sid")
+    ):
+        raise credentials_exception
+
+    if response is not None:
+        renewed = renew_access_token(payload)
+        if renewed is not None:
+            set_access_cookie(response, renewed)
+
+    if AUTH_CLAIMS_MODE and "username" in payload:
+        return schemas.Principal(id=user_id, username=payload["username"])
+
+    if AUTH_LIGHTWEIGHT_PRINCIPAL:
+        principal = principal_cache.get(user_id)
+        if principal is not None:
+            return principal
+
     result = await db.execute(select(models.User).where(models.User.id == user_id))
     user = result.scalar_one_or_none()
     if user is None:
         raise credentials_exception
 
-    return user
+    if not AUTH_LIGHTWEIGHT_PRINCIPAL:
+        return user
+
+    principal = schemas.Principal(id=user.id, username=user.username)
+    principal_cache.set(user_id, principal)
+    return principal
@@ -0,0 +1,94 @@
+import math
+import time
+from collections import OrderedDict
+from fastapi import HTTPException, status
+from app.config import (
+    LOGIN_USER_RATE,
+    LOGIN_USER_BURST,
+    LOGIN_IP_RATE,
+    LOGIN_IP_BURST,
+    LOGIN_THROTTLE_MAX_KEYS,
+)
+
+
+class TokenBucketLimiter:
+    """In-memory token buckets keyed by an arbitrary string.
+
+    Each key holds up to ``burst`` tokens and regains ``rate`` tokens per
+    second. Only the ``max_keys`` most recently used keys are tracked; an
+    evicted key simply starts again with a full bucket.
+    """
+
+    def __init__(self, rate: float, burst: int, max_keys: int):
+        self.rate = rate
+        self.burst = burst
+        self.max_keys = max_keys
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+
+    def _tokens(self, key: str, now: float) -> float:
+        entry = self._buckets.get(key)
+        if entry is None:
+            return float(self.burst)
+        tokens, updated = entry
+        return min(float(self.burst), tokens + (now - updated) * self.rate)
+
+    def retry_after(self, key: str, now: float | None = None) -> float:
+        """Seconds until ``key`` has a whole token, or 0 if it has one now."""
+        now = time.monotonic() if now is None else now
+        missing = 1 - self._tokens(key, now)
+        if missing <= 0:
+            return 0.0
+        return missing / self.rate if self.rate > 0 else math.inf
+
+    def consume(self, key: str, now: float | None = None):
+        now = time.monotonic() if now is None else now
+        self._buckets[key] = (self._tokens(key, now) - 1, now)
+        self._buckets.move_to_end(key)
+        while len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+
+    def reset(self):
+        self._buckets.clear()
+
+
+class LoginThrottle:
+    """Rejects login attempts once a username or client IP runs out of tokens."""
+
+    def __init__(self, by_username: TokenBucketLimiter, by_ip: TokenBucketLimiter):
+        self.by_username = by_username
+        self.by_ip = by_ip
+
+    def check(self, username: str, client_ip: str | None):
+        now = time.monotonic()
+        limits = [(self.by_username, f"user:{username}")]
+        if client_ip is not None:
+            limits.append((self.by_ip, f"ip:{client_ip}"))
+
+        # Only spend tokens once every bucket has one, so a rejected attempt is free
+        wait = max(limiter.retry_after(key, now) for limiter, key in limits)
+        if wait > 0:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many login attempts, please try again later",
+                headers={"Retry-After": str(max(1, math.ceil(min(wait, 3600))))},
+            )
+        for limiter, key in limits:
+            limiter.consume(key, now)
+
+    def reset(self):
+        self.by_username.reset()
+        self.by_ip.reset()
+
+
+login_throttle = LoginThrottle(
+    by_username=TokenBucketLimiter(
+        rate=LOGIN_USER_RATE / 60,
+        burst=LOGIN_USER_BURST,
+        max_keys=LOGIN_THROTTLE_MAX_KEYS,
+    ),
+    by_ip=TokenBucketLimiter(
+        rate=LOGIN_IP_RATE / 60,
+        burst=LOGIN_IP_BURST,
+        max_keys=LOGIN_THROTTLE_MAX_KEYS,
+    ),
+)
@@ -1,14 +1,16 @@
-import uuid
-from sqlalchemy import Column, String, ForeignKey, Float
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, String, ForeignKey, Float, Index
 from sqlalchemy.orm import relationship
 from app.database import Base
+from app.ids import new_id
+from app.types import GUID
 
 
 class Client(Base):
     __tablename__ = "clients"
+    # Serves per-user lookups and the id-ordered keyset pagination of the list
+    __table_args__ = (Index("ix_clients_user_id_id", "user_id", "id"),)
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(GUID(), primary_key=True, default=new_id)
     name = Column(String, nullable=False)
     notes = Column(String, nullable=True)
     rate = Column(Float, nullable=True)
@@ -17,5 +19,5 @@ class Client(Base):
         "Project", back_populates="client"
     )
 
-    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
+    user_id = Column(GUID(), ForeignKey("users.id"), nullable=False)
     user = relationship("User", back_populates="clients")
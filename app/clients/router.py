@@ -1,5 +1,5 @@
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.auth.models import User
 from app.clients.schemas import ClientCreate, ClientRead, ClientUpdate
@@ -10,7 +10,9 @@ from app.clients.services import (
     update_client,
     delete_client,
 )
-from app.database import get_db
+from app.database import get_read_db, get_write_db
+from app.pagination import PageParams, page_params
+from app.responses import page_response
 from app.auth.services import get_current_user
 
 router = APIRouter()
@@ -19,7 +21,7 @@ router = APIRouter()
 @router.post("/", response_model=ClientRead)
 async def new_client(
     client_in: ClientCreate,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_write_db),
     current_user: User = Depends(get_current_user),
 ):
     client = await create_client(db, client_in, user_id=current_user.id)
@@ -29,46 +31,40 @@ async def new_client(
 @router.get("/get/{client_id}", response_model=ClientRead)
 async def get_client(
     client_id: str,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
 ):
-    client = await read_client(db, UUID(client_id))
-    if client is None or client.user_id != current_user.id:
-        raise HTTPException(status_code=404, detail="Client not found")
+    client = await read_client(db, UUID(client_id), user_id=current_user.id)
     return client
 
 
 @router.get("/all/", response_model=list[ClientRead])
 async def list_clients(
-    db: AsyncSession = Depends(get_db),
+    response: Response,
+    page: PageParams = Depends(page_params),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
 ):
-    clients = await read_clients(db, user_id=current_user.id)
-    return clients
+    clients = await read_clients(db, user_id=current_user.id, page=page)
+    return page_response(response, ClientRead, clients)
 
 
 @router.patch("/{client_id}", response_model=ClientRead)
 async def update_client_endpoint(
     client_id: str,
     client_in: ClientUpdate,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_write_db),
     current_user: User = Depends(get_current_user),
 ):
-    client = await read_client(db, UUID(client_id))
-    if client is None or client.user_id != current_user.id:
-        raise HTTPException(status_code=404, detail="Client not found")
-    client = await update_client(db, client, client_in)
+    client = await update_client(db, UUID(client_id), current_user.id, client_in)
     return client
 
 
 @router.delete("/{client_id}", response_model=ClientRead)
 async def delete_client_endpoint(
     client_id: str,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_write_db),
     current_user: User = Depends(get_current_user),
 ):
-    client = await read_client(db, UUID(client_id))
-    if client is None or client.user_id != current_user.id:
-        raise HTTPException(status_code=404, detail="Client not found")
-    client = await delete_client(db, client)
+    client = await delete_client(db, UUID(client_id), user_id=current_user.id)
     return client
@@ -1,50 +1,42 @@
 from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import update
 from app.clients.models import Client
 from app.clients.schemas import ClientCreate, ClientUpdate
+from app.pagination import PageParams
 from app.projects.models import Project
+from app.repository import ScopedRepository
 from sqlalchemy.ext.asyncio import AsyncSession
 
+client_repository = ScopedRepository(Client, not_found="Client not found")
+
 
 async def create_client(db: AsyncSession, client_in: ClientCreate, user_id: UUID):
-    client = Client(**client_in.model_dump(), user_id=user_id)
-    db.add(client)
-    await db.commit()
-    await db.refresh(client)
-    return client
+    return await client_repository.create(db, user_id, client_in.model_dump())
 
 
-async def read_client(db: AsyncSession, client_id: UUID):
-    result = await db.get(Client, client_id)
-    return result
+async def read_client(db: AsyncSession, client_id: UUID, user_id: UUID):
+    return await client_repository.get(db, client_id, user_id)
 
 
-async def read_clients(db: AsyncSession, user_id: UUID):
-    result = await db.execute(select(Client).where(Client.user_id == user_id))
-    clients = result.scalars().all()
-    return clients
+async def read_clients(db: AsyncSession, user_id: UUID, page: PageParams):
+    return await client_repository.page(db, user_id, page)
 
 
-async def update_client(db: AsyncSession, client: Client, client_in: ClientUpdate):
-    for field, value in client_in.model_dump(exclude_unset=True).items():
-        setattr(client, field, value)
-    db.add(client)
-    await db.commit()
-    await db.refresh(client)
-    return client
+async def update_client(
+    db: AsyncSession, client_id: UUID, user_id: UUID, client_in: ClientUpdate
+):
+    changes = client_in.model_dump(exclude_unset=True)
+    return await client_repository.update(db, client_id, user_id, changes)
 
 
-async def delete_client(db: AsyncSession, client: Client):
-    # Set client_id to None for all projects associated with this client
-    result = await db.execute(
-        select(Project).where(Project.client_id == client.id)
+async def delete_client(db: AsyncSession, client_id: UUID, user_id: UUID):
+    # Detach the client's projects in one statement instead of loading them
+    detach_projects = (
+        update(Project)
+        .where(Project.client_id.in_(client_repository.owned_ids(client_id, user_id)))
+        .values(client_id=None)
+    )
+    return await client_repository.delete(
+        db, client_id, user_id, before=[detach_projects]
     )
-    projects = result.scalars().all()
-    for project in projects:
-        project.client_id = None
-        db.add(project)
-    
-    await db.delete(client)
-    await db.commit()
-    return client
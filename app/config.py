@@ -1,3 +1,5 @@
+import os
+
 from starlette.config import Config
 
 config = Config(".env")
@@ -7,3 +9,115 @@ JWT_ALG: str = config("ALGORITHM")
 JWT_SECRET: str = config("SECRET_KEY")
 
 SQLALCHEMY_DATABASE_URI = config("DATABASE_URL")
+
+# Password hashing runs in a bounded worker pool so bcrypt never blocks the event loop
+PASSWORD_HASH_WORKERS: int = config(
+    "PASSWORD_HASH_WORKERS", cast=int, default=os.cpu_count() or 1
+)
+PASSWORD_HASH_QUEUE_TIMEOUT: float = config(
+    "PASSWORD_HASH_QUEUE_TIMEOUT", cast=float, default=5.0
+)  # Seconds to wait for a free worker before answering 503
+
+# Authenticated-principal cache used by get_current_user
+AUTH_PRINCIPAL_CACHE_SIZE: int = config(
+    "AUTH_PRINCIPAL_CACHE_SIZE", cast=int, default=1024
+)  # 0 disables the cache
+AUTH_PRINCIPAL_CACHE_TTL: float = config(
+    "AUTH_PRINCIPAL_CACHE_TTL", cast=float, default=60.0
+)  # Seconds
+AUTH_LIGHTWEIGHT_PRINCIPAL: bool = config(
+    "AUTH_LIGHTWEIGHT_PRINCIPAL", cast=bool, default=True
+)  # Return a cached Principal instead of a session-bound User
+
+# Verified-JWT cache; entries live until the token's own exp claim
+JWT_CACHE_SIZE: int = config("JWT_CACHE_SIZE", cast=int, default=4096)  # 0 disables
+
+# Claims-only auth: tokens carry id and username, so get_current_user needs no query.
+# A deleted user's token stays usable until it expires.
+AUTH_CLAIMS_MODE: bool = config("AUTH_CLAIMS_MODE", cast=bool, default=False)
+
+# Login throttling (token buckets, rates are attempts per minute)
+LOGIN_USER_RATE: float = config("LOGIN_USER_RATE", cast=float, default=10.0)
+LOGIN_USER_BURST: int = config("LOGIN_USER_BURST", cast=int, default=10)
+LOGIN_IP_RATE: float = config("LOGIN_IP_RATE", cast=float, default=60.0)
+LOGIN_IP_BURST: int = config("LOGIN_IP_BURST", cast=int, default=30)
+LOGIN_THROTTLE_MAX_KEYS: int = config(
+    "LOGIN_THROTTLE_MAX_KEYS", cast=int, default=100_000
+)
+
+# bcrypt cost; pick a value with `python -m app.auth.calibrate`. Hashes made with a
+# different cost are rehashed in the background on the next successful login.
+BCRYPT_ROUNDS: int | None = config("BCRYPT_ROUNDS", cast=int, default=None)
+LOGIN_HASH_BUDGET_MS: float = config(
+    "LOGIN_HASH_BUDGET_MS", cast=float, default=250.0
+)  # Target time for one password verify, used by the calibration command
+
+# Server-side token revocation (logout). Revoked jtis are held in memory until
+# their token expires and persisted to the revoked_tokens table.
+REVOCATION_BLOOM_BITS: int = config(
+    "REVOCATION_BLOOM_BITS", cast=int, default=0
+)  # Size of an optional Bloom-filter front; slower than the dict alone in CPython
+REVOCATION_BLOOM_HASHES: int = config("REVOCATION_BLOOM_HASHES", cast=int, default=4)
+REVOCATION_SYNC_INTERVAL: float = config(
+    "REVOCATION_SYNC_INTERVAL", cast=float, default=0.0
+)  # Seconds between pulls of other workers' revocations; 0 for a single process
+
+# Sliding sessions: once this fraction of a token's lifetime has passed, the next
+# authenticated request gets a fresh access_token cookie. 0 disables renewal.
+JWT_RENEW_FRACTION: float = config("JWT_RENEW_FRACTION", cast=float, default=0.5)
+# Renewal stops this many seconds after the password login that started the
+# session; its last token runs out then. 0 lets sessions renew indefinitely.
+SESSION_MAX_AGE: int = config("SESSION_MAX_AGE", cast=int, default=24 * 3600)
+
+# SQLite connection tuning. SQLITE_PROFILE picks a named set of PRAGMAs from
+# app/database.py (durability, balanced, throughput); any SQLITE_* value set
+# here overrides that PRAGMA from the profile.
+SQLITE_PROFILE: str = config("SQLITE_PROFILE", default="balanced")
+SQLITE_JOURNAL_MODE: str | None = config("SQLITE_JOURNAL_MODE", default=None)
+SQLITE_SYNCHRONOUS: str | None = config("SQLITE_SYNCHRONOUS", default=None)
+SQLITE_MMAP_SIZE: int | None = config("SQLITE_MMAP_SIZE", cast=int, default=None)  # Bytes
+SQLITE_CACHE_SIZE: int | None = config(
+    "SQLITE_CACHE_SIZE", cast=int, default=None
+)  # Pages, or KiB when negative
+SQLITE_TEMP_STORE: str | None = config("SQLITE_TEMP_STORE", default=None)
+SQLITE_BUSY_TIMEOUT: int | None = config(
+    "SQLITE_BUSY_TIMEOUT", cast=int, default=None
+)  # Milliseconds
+SQLITE_FOREIGN_KEYS: str | None = config("SQLITE_FOREIGN_KEYS", default=None)
+
+# Connection topology: a pool of read-only connections plus a single writer
+SQLITE_READ_POOL_SIZE: int = config("SQLITE_READ_POOL_SIZE", cast=int, default=4)
+SQLITE_WRITE_TIMEOUT: float = config(
+    "SQLITE_WRITE_TIMEOUT", cast=float, default=30.0
+)  # Seconds a write transaction may wait for the writer connection
+
+# Group commit: write operations from concurrent requests that arrive within the
+# window share one transaction (and one fsync). 0 disables grouping.
+GROUP_COMMIT_WINDOW_MS: float = config("GROUP_COMMIT_WINDOW_MS", cast=float, default=0.0)
+GROUP_COMMIT_MAX_BATCH: int = config("GROUP_COMMIT_MAX_BATCH", cast=int, default=64)
+
+# Postgres connection pool, used when DATABASE_URL is a postgresql:// URL
+# (anything without a scheme is taken as a SQLite file path)
+DB_POOL_SIZE: int = config("DB_POOL_SIZE", cast=int, default=10)
+DB_MAX_OVERFLOW: int = config("DB_MAX_OVERFLOW", cast=int, default=10)
+DB_POOL_TIMEOUT: float = config(
+    "DB_POOL_TIMEOUT", cast=float, default=30.0
+)  # Seconds to wait for a free connection
+DB_POOL_RECYCLE: int = config(
+    "DB_POOL_RECYCLE", cast=int, default=1800
+)  # Seconds before a connection is replaced; -1 keeps them forever
+DB_STATEMENT_CACHE_SIZE: int = config(
+    "DB_STATEMENT_CACHE_SIZE", cast=int, default=100
+)  # Prepared statements cached per asyncpg connection; 0 behind PgBouncer
+
+# Primary-key generator for new rows: "uuid7" (time-ordered) or "uuid4" (random)
+ID_STRATEGY: str = config("ID_STRATEGY", default="uuid7")
+
+# List endpoints are keyset-paginated: ?limit= rows per page (default below), and
+# the X-Next-Cursor response header is passed back as ?cursor= for the next page
+PAGE_SIZE_DEFAULT: int = config("PAGE_SIZE_DEFAULT", cast=int, default=100)
+PAGE_SIZE_MAX: int = config("PAGE_SIZE_MAX", cast=int, default=1000)
+
+# List endpoints serialize their page straight to JSON bytes with a cached pydantic
+# TypeAdapter instead of FastAPI's validate, jsonable dict, json.dumps path
+SERIALIZE_ONCE: bool = config("SERIALIZE_ONCE", cast=bool, default=False)
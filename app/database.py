@@ -1,16 +1,304 @@
-from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
-from app.config import SQLALCHEMY_DATABASE_URI
+import asyncio
+import re
+from typing import Awaitable, Callable, TypeVar
+from sqlalchemy import URL, event, make_url
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from app.config import (
+    SQLALCHEMY_DATABASE_URI,
+    SQLITE_PROFILE,
+    SQLITE_JOURNAL_MODE,
+    SQLITE_SYNCHRONOUS,
+    SQLITE_MMAP_SIZE,
+    SQLITE_CACHE_SIZE,
+    SQLITE_TEMP_STORE,
+    SQLITE_BUSY_TIMEOUT,
+    SQLITE_FOREIGN_KEYS,
+    SQLITE_READ_POOL_SIZE,
+    SQLITE_WRITE_TIMEOUT,
+    GROUP_COMMIT_WINDOW_MS,
+    GROUP_COMMIT_MAX_BATCH,
+    DB_POOL_SIZE,
+    DB_MAX_OVERFLOW,
+    DB_POOL_TIMEOUT,
+    DB_POOL_RECYCLE,
+    DB_STATEMENT_CACHE_SIZE,
+)
 from sqlalchemy.ext.declarative import declarative_base
 
 Base = declarative_base()
 
-sqlite_url = f"sqlite+aiosqlite:///{SQLALCHEMY_DATABASE_URI}"
+T = TypeVar("T")
+WriteOp = Callable[[AsyncSession], Awaitable[T]]
 
-engine = create_async_engine(sqlite_url, echo=False)
+# Named PRAGMA sets, applied to every new SQLite connection
+SQLITE_PROFILES: dict[str, dict[str, str | int]] = {
+    # fsync on every commit; nothing committed is lost on power failure
+    "durability": {
+        "journal_mode": "WAL",
+        "synchronous": "FULL",
+        "foreign_keys": "ON",
+        "busy_timeout": 5000,
+    },
+    # WAL with NORMAL sync: a power cut may drop the last commits, never corrupts
+    "balanced": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "cache_size": -16000,
+        "temp_store": "MEMORY",
+        "foreign_keys": "ON",
+        "busy_timeout": 5000,
+    },
+    # Larger page cache and memory-mapped reads on top of balanced
+    "throughput": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "mmap_size": 256 * 1024 * 1024,
+        "cache_size": -64000,
+        "temp_store": "MEMORY",
+        "foreign_keys": "ON",
+        "busy_timeout": 5000,
+    },
+}
 
-async_session = async_sessionmaker(bind=engine, expire_on_commit=False)
+_PRAGMA_VALUE = re.compile(r"^-?\w+$")
 
 
-async def get_db():
-    async with async_session() as session:
+def sqlite_pragmas(profile: str = SQLITE_PROFILE) -> dict[str, str | int]:
+    """PRAGMAs for ``profile`` with any SQLITE_* config overrides applied."""
+    if profile not in SQLITE_PROFILES:
+        raise ValueError(
+            f"Unknown SQLITE_PROFILE {profile!r}, expected one of {sorted(SQLITE_PROFILES)}"
+        )
+    pragmas = dict(SQLITE_PROFILES[profile])
+    overrides = {
+        "journal_mode": SQLITE_JOURNAL_MODE,
+        "synchronous": SQLITE_SYNCHRONOUS,
+        "mmap_size": SQLITE_MMAP_SIZE,
+        "cache_size": SQLITE_CACHE_SIZE,
+        "temp_store": SQLITE_TEMP_STORE,
+        "busy_timeout": SQLITE_BUSY_TIMEOUT,
+        "foreign_keys": SQLITE_FOREIGN_KEYS,
+    }
+    pragmas.update({k: v for k, v in overrides.items() if v is not None})
+    return pragmas
+
+
+def apply_sqlite_pragmas(engine: AsyncEngine, pragmas: dict[str, str | int]):
+    """Run ``pragmas`` on every connection ``engine`` opens."""
+    for value in pragmas.values():
+        if not _PRAGMA_VALUE.match(str(value)):
+            raise ValueError(f"Invalid PRAGMA value {value!r}")
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def _set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        # journal_mode first: it cannot change once a transaction has started
+        for name, value in sorted(pragmas.items(), key=lambda p: p[0] != "journal_mode"):
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+
+
+def use_immediate_transactions(engine: AsyncEngine):
+    """Make every transaction on ``engine`` start with BEGIN IMMEDIATE.
+
+    The write lock is then taken up front instead of on the first write, so a
+    writer never fails half-way through with "database is locked". Taking over
+    transaction control from pysqlite also makes SAVEPOINTs work.
+    """
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def _disable_pysqlite_transactions(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine.sync_engine, "begin")
+    def _begin_immediate(conn):
+        conn.exec_driver_sql("BEGIN IMMEDIATE")
+
+
+def database_url(value: str) -> URL:
+    """SQLAlchemy URL for DATABASE_URL: a full URL, or a bare SQLite file path."""
+    if "://" not in value:
+        return make_url(f"sqlite+aiosqlite:///{value}")
+    url = make_url(value)
+    if url.drivername in ("postgres", "postgresql"):
+        url = url.set(drivername="postgresql+asyncpg")
+    return url
+
+
+def postgres_engine(url: URL) -> AsyncEngine:
+    """Pooled engine for a Postgres ``url``, sized from the DB_* settings."""
+    connect_args = {}
+    if url.get_driver_name() == "asyncpg":
+        # asyncpg's own statement cache and SQLAlchemy's cache on top of it
+        connect_args = {
+            "statement_cache_size": DB_STATEMENT_CACHE_SIZE,
+            "prepared_statement_cache_size": DB_STATEMENT_CACHE_SIZE,
+        }
+    return create_async_engine(
+        url,
+        echo=False,
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_timeout=DB_POOL_TIMEOUT,
+        pool_recycle=DB_POOL_RECYCLE,
+        pool_pre_ping=True,
+        connect_args=connect_args,
+    )
+
+
+url = database_url(SQLALCHEMY_DATABASE_URI)
+
+is_sqlite = url.get_backend_name() == "sqlite"
+
+in_memory = is_sqlite and url.database in (None, "", ":memory:")
+
+if not is_sqlite:
+    # Postgres handles concurrent writers itself, so one pool serves both roles
+    write_engine = read_engine = postgres_engine(url)
+else:
+    # One writer connection: concurrent write transactions queue for it in the
+    # pool rather than colliding on SQLite's database lock. (In-memory databases
+    # already use a single shared connection.)
+    write_engine = create_async_engine(
+        url,
+        echo=False,
+        **(
+            {}
+            if in_memory
+            else {"pool_size": 1, "max_overflow": 0, "pool_timeout": SQLITE_WRITE_TIMEOUT}
+        ),
+    )
+    apply_sqlite_pragmas(write_engine, sqlite_pragmas())
+    use_immediate_transactions(write_engine)
+
+if in_memory:
+    # A private in-memory database cannot be shared between engines
+    read_engine = write_engine
+elif is_sqlite:
+    # WAL lets these read alongside the writer; query_only guards against writes
+    read_engine = create_async_engine(
+        url,
+        echo=False,
+        pool_size=SQLITE_READ_POOL_SIZE,
+        max_overflow=0,
+    )
+    read_pragmas = {k: v for k, v in sqlite_pragmas().items() if k != "journal_mode"}
+    apply_sqlite_pragmas(read_engine, {**read_pragmas, "query_only": "ON"})
+
+write_session = async_sessionmaker(bind=write_engine, expire_on_commit=False)
+read_session = async_sessionmaker(bind=read_engine, expire_on_commit=False)
+
+
+class GroupCommitter:
+    """Runs write operations from concurrent callers in one shared transaction.
+
+    Operations queue until ``window`` seconds pass or ``max_batch`` are waiting,
+    then run one after another on a single writer session, each inside its own
+    SAVEPOINT, followed by one COMMIT. A failing operation only rolls back its
+    savepoint and only its caller sees the exception; every other caller's
+    result is delivered once the shared commit has succeeded.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        window: float,
+        max_batch: int,
+    ):
+        self.session_factory = session_factory
+        self.window = window
+        self.max_batch = max_batch
+        self._pending: list[tuple[WriteOp, asyncio.Future]] = []
+        self._timer: asyncio.TimerHandle | None = None
+        self._flushes: set[asyncio.Task] = set()
+
+    async def run(self, op: WriteOp[T]) -> T:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((op, future))
+        if len(self._pending) >= self.max_batch:
+            self._start_flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self._start_flush)
+        return await future
+
+    def _start_flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        task = asyncio.ensure_future(self._flush(batch))
+        self._flushes.add(task)
+        task.add_done_callback(self._flushes.discard)
+
+    async def _flush(self, batch: list[tuple[WriteOp, asyncio.Future]]):
+        outcomes = []
+        try:
+            async with self.session_factory() as session:
+                async with session.begin():
+                    for op, future in batch:
+                        if future.done():  # Caller was cancelled while queued
+                            continue
+                        try:
+                            async with session.begin_nested():
+                                outcomes.append((future, await op(session), None))
+                        except Exception as exc:
+                            outcomes.append((future, None, exc))
+        except Exception as exc:
+            # The shared commit failed, so nothing in this batch was written
+            for op, future in batch:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+
+        for future, result, exc in outcomes:
+            if future.done():
+                continue
+            if exc is not None:
+                future.set_exception(exc)
+            else:
+                future.set_result(result)
+
+
+group_committer: GroupCommitter | None = None
+if GROUP_COMMIT_WINDOW_MS > 0:
+    group_committer = GroupCommitter(
+        write_session,
+        window=GROUP_COMMIT_WINDOW_MS / 1000,
+        max_batch=GROUP_COMMIT_MAX_BATCH,
+    )
+
+
+async def run_write(db: AsyncSession, op: WriteOp[T]) -> T:
+    """Run ``op`` and commit it, through the group committer when enabled.
+
+    ``op`` receives the session to write with and must not commit. Without
+    group commit that session is ``db``, which is rolled back if ``op`` fails.
+    """
+    if group_committer is not None:
+        return await group_committer.run(op)
+    try:
+        result = await op(db)
+        await db.commit()
+    except Exception:
+        await db.rollback()
+        raise
+    return result
+
+
+async def get_read_db():
+    async with read_session() as session:
+        yield session
+
+
+async def get_write_db():
+    # With group commit the writer connection belongs to the committer, and
+    # the request session is only used for lookups ahead of run_write
+    factory = read_session if group_committer is not None else write_session
+    async with factory() as session:
         yield session
@@ -0,0 +1,81 @@
+from functools import lru_cache
+from typing import Any, Callable
+from fastapi import HTTPException, Query, Response
+from pydantic import BaseModel, ConfigDict, TypeAdapter, create_model
+
+# Always returned, whatever ?fields= asks for
+REQUIRED_FIELDS = ("id",)
+
+# Describe the body, so they come from the response being returned
+_BODY_HEADERS = (b"content-length", b"content-type")
+
+
+def fields_param(schema: type[BaseModel]) -> Callable[..., tuple[str, ...] | None]:
+    """Dependency for ``?fields=a,b,c``: a subset of ``schema``'s fields, or None for all.
+
+    The result is in ``schema`` order and always includes ``id``, so equal
+    requests share one cached partial schema.
+    """
+    allowed = tuple(schema.model_fields)
+
+    def dependency(
+        fields: str | None = Query(
+            None, description=f"Comma-separated subset of: {', '.join(allowed)}"
+        ),
+    ) -> tuple[str, ...] | None:
+        if not fields:
+            return None
+        requested = {name.strip() for name in fields.split(",") if name.strip()}
+        unknown = requested - set(allowed)
+        if unknown:
+            raise HTTPException(
+                status_code=422,
+                detail=f"Unknown fields: {', '.join(sorted(unknown))}",
+            )
+        requested.update(REQUIRED_FIELDS)
+        return tuple(name for name in allowed if name in requested)
+
+    return dependency
+
+
+@lru_cache(maxsize=256)
+def _partial_adapter(schema: type[BaseModel], fields: tuple[str, ...], many: bool):
+    partial = create_model(
+        f"{schema.__name__}Fields",
+        __config__=ConfigDict(from_attributes=True),
+        **{name: (schema.model_fields[name].annotation, ...) for name in fields},
+    )
+    return TypeAdapter(list[partial] if many else partial)
+
+
+def forward_headers(source: Response, target: Response) -> Response:
+    """Copy the headers set on the injected ``source`` onto ``target``.
+
+    FastAPI only applies the Response parameter to responses it builds itself,
+    so an endpoint returning its own Response would otherwise drop whatever
+    dependencies set there, e.g. the renewed access_token cookie.
+    """
+    target.raw_headers.extend(
+        header for header in source.raw_headers if header[0] not in _BODY_HEADERS
+    )
+    return target
+
+
+def sparse_response(
+    response: Response,
+    schema: type[BaseModel],
+    fields: tuple[str, ...],
+    content: Any,
+    headers: dict[str, str] | None = None,
+) -> Response:
+    """JSON response holding only ``fields`` of ``schema``, for one row or a list.
+
+    Rows may be ORM objects, the column rows a narrowed SELECT returns, or
+    the dicts of a repository page; anything else they carry is left out.
+    Headers set on the endpoint's injected ``response`` are kept.
+    """
+    adapter = _partial_adapter(schema, fields, isinstance(content, (list, tuple)))
+    body = adapter.dump_json(adapter.validate_python(content, from_attributes=True))
+    return forward_headers(
+        response, Response(content=body, media_type="application/json", headers=headers)
+    )
@@ -0,0 +1,45 @@
+import os
+import threading
+import time
+import uuid
+from app.config import ID_STRATEGY
+
+_lock = threading.Lock()
+_last_ms = 0
+_counter = 0
+
+
+def uuid7() -> uuid.UUID:
+    """Time-ordered UUID (RFC 9562 version 7).
+
+    48 bits of Unix milliseconds lead the value, so new keys land at the right
+    edge of a B-tree index instead of at random pages. Within one millisecond
+    the 12-bit rand_a field is used as a counter, which keeps ids from one
+    process strictly increasing.
+    """
+    global _last_ms, _counter
+    with _lock:
+        now_ms = time.time_ns() // 1_000_000
+        if now_ms > _last_ms:
+            _last_ms = now_ms
+            # Start low in the counter space so many ids fit in one millisecond
+            _counter = int.from_bytes(os.urandom(2), "big") & 0x1FF
+        else:
+            _counter += 1
+            if _counter > 0xFFF:
+                _last_ms += 1
+                _counter = 0
+        ms, counter = _last_ms, _counter
+
+    rand_b = int.from_bytes(os.urandom(8), "big") & ((1 << 62) - 1)
+    value = (ms & ((1 << 48) - 1)) << 80
+    value |= 0x7 << 76 | counter << 64
+    value |= 0b10 << 62 | rand_b
+    return uuid.UUID(int=value)
+
+
+def new_id() -> uuid.UUID:
+    """Primary key for a new row, following ID_STRATEGY."""
+    if ID_STRATEGY == "uuid4":
+        return uuid.uuid4()
+    return uuid7()
@@ -5,14 +5,23 @@ from fastapi.middleware.cors import CORSMiddleware
 from app.auth.router import router as auth_router
 from app.clients.router import router as client_router
 from app.projects.router import router as project_router
-from app.database import Base, engine
+from app.auth.hashing import password_hasher
+from app.auth.services import load_revocations, purge_expired_revocations
+from app.database import write_engine, write_session, read_session
+from app.migrations import run_migrations
+from app.pagination import NEXT_CURSOR_HEADER
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+    async with write_engine.begin() as conn:
+        await conn.run_sync(run_migrations)
+    async with write_session() as db:
+        await purge_expired_revocations(db)
+    async with read_session() as db:
+        await load_revocations(db)
     yield
+    password_hasher.shutdown()
 
 
 app = FastAPI(lifespan=lifespan)
@@ -30,4 +39,5 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
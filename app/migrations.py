@@ -0,0 +1,178 @@
+"""Versioned schema migrations, applied in order at startup.
+
+Applied versions are recorded in ``schema_migrations``. Version 1 creates
+whatever tables are missing from the current models, so a fresh database
+starts out at the latest schema. Every later migration therefore has to be
+a no-op on a schema that already has its change (e.g. ``checkfirst=True``),
+and must also bring older databases up to date.
+
+Rewriting values in place leaves the freed space inside the database file;
+run ``VACUUM`` afterwards to hand it back to the filesystem.
+"""
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Callable
+from sqlalchemy import (
+    Column,
+    Connection,
+    DateTime,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    insert,
+    select,
+)
+import app.models  # noqa: F401
+from app.database import Base
+from app.types import GUID
+
+
+migration_metadata = MetaData()
+
+# Rows rewritten per statement by binary_uuid_keys, so memory stays flat
+# however large the tables are
+UUID_REWRITE_BATCH = 10_000
+
+schema_migrations = Table(
+    "schema_migrations",
+    migration_metadata,
+    Column("version", Integer, primary_key=True),
+    Column("name", String, nullable=False),
+    Column("applied_at", DateTime, nullable=False),
+)
+
+
+@dataclass(frozen=True)
+class Migration:
+    version: int
+    name: str
+    upgrade: Callable[[Connection], None]
+
+
+def _create_indexes(conn: Connection, *names: str):
+    indexes = {
+        index.name: index
+        for table in Base.metadata.sorted_tables
+        for index in table.indexes
+    }
+    for name in names:
+        # Indexes since dropped from the models are also dropped by a later
+        # migration, so there is no point creating them first
+        if name in indexes:
+            indexes[name].create(conn, checkfirst=True)
+
+
+def _drop_indexes(conn: Connection, *names: str):
+    for name in names:
+        conn.exec_driver_sql(f"DROP INDEX IF EXISTS {name}")
+
+
+def initial_schema(conn: Connection):
+    Base.metadata.create_all(conn)
+
+
+def foreign_key_indexes(conn: Connection):
+    _create_indexes(
+        conn,
+        "ix_clients_user_id",
+        "ix_projects_client_id",
+        "ix_projects_user_id_client_id",
+        "ix_tasks_project_id",
+        "ix_tasks_user_id_project_id",
+    )
+
+
+def binary_uuid_keys(conn: Connection):
+    """Rewrite hex-text UUIDs as 16-byte blobs on SQLite.
+
+    The declared column types stay as they are: SQLite stores blobs as-is in
+    any column, so rebuilding each table would only cost time.
+    """
+    if conn.dialect.name != "sqlite":
+        return
+    # Parents and children are rewritten in separate statements, so their
+    # foreign keys only line up again once every table is done
+    conn.exec_driver_sql("PRAGMA defer_foreign_keys = ON")
+    for table in Base.metadata.sorted_tables:
+        columns = [c.name for c in table.columns if isinstance(c.type, GUID)]
+        if not columns:
+            continue
+        pending = " OR ".join(f"typeof({c}) = 'text'" for c in columns)
+        query = (
+            f"SELECT rowid, {', '.join(columns)} FROM {table.name}"
+            f" WHERE rowid > ? AND ({pending}) ORDER BY rowid LIMIT ?"
+        )
+        assignments = ", ".join(f"{c} = ?" for c in columns)
+        last_rowid = 0
+        while True:
+            rows = conn.exec_driver_sql(query, (last_rowid, UUID_REWRITE_BATCH)).all()
+            if not rows:
+                break
+            conn.exec_driver_sql(
+                f"UPDATE {table.name} SET {assignments} WHERE rowid = ?",
+                [
+                    tuple(
+                        uuid.UUID(value).bytes if isinstance(value, str) else value
+                        for value in values
+                    )
+                    + (rowid,)
+                    for rowid, *values in rows
+                ],
+            )
+            last_rowid = rows[-1][0]
+
+
+def keyset_indexes(conn: Connection):
+    _create_indexes(
+        conn,
+        "ix_clients_user_id_id",
+        "ix_projects_user_id_id",
+        "ix_projects_user_id_client_id_id",
+        "ix_tasks_user_id_id",
+        "ix_tasks_user_id_project_id_id",
+    )
+    # Each is a prefix of one of the new indexes
+    _drop_indexes(
+        conn,
+        "ix_clients_user_id",
+        "ix_projects_user_id_client_id",
+        "ix_tasks_user_id_project_id",
+    )
+
+
+def deadline_sort_indexes(conn: Connection):
+    _create_indexes(
+        conn, "ix_projects_user_id_deadline_id", "ix_tasks_user_id_deadline_id"
+    )
+
+
+MIGRATIONS: list[Migration] = [
+    Migration(1, "initial schema", initial_schema),
+    Migration(2, "foreign key indexes", foreign_key_indexes),
+    Migration(3, "binary uuid keys", binary_uuid_keys),
+    Migration(4, "keyset pagination indexes", keyset_indexes),
+    Migration(5, "deadline sort indexes", deadline_sort_indexes),
+]
+
+
+def run_migrations(conn: Connection) -> list[int]:
+    """Apply pending migrations on ``conn`` and return the versions applied."""
+    schema_migrations.create(conn, checkfirst=True)
+    applied = set(conn.execute(select(schema_migrations.c.version)).scalars())
+
+    newly_applied = []
+    for migration in sorted(MIGRATIONS, key=lambda m: m.version):
+        if migration.version in applied:
+            continue
+        migration.upgrade(conn)
+        conn.execute(
+            insert(schema_migrations).values(
+                version=migration.version,
+                name=migration.name,
+                applied_at=datetime.now(timezone.utc).replace(tzinfo=None),
+            )
+        )
+        newly_applied.append(migration.version)
+    return newly_applied
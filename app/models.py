@@ -0,0 +1,5 @@
+# Import every model module so relationship() names resolve and
+# Base.metadata knows all tables, even when the routers are not loaded.
+from app.auth.models import User  # noqa: F401
+from app.clients.models import Client  # noqa: F401
+from app.projects.models import Project, Task  # noqa: F401
@@ -0,0 +1,118 @@
+import base64
+import binascii
+import json
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Callable, Generic, Iterable, Sequence, TypeVar
+from uuid import UUID
+from fastapi import HTTPException, Query, Response
+from app.config import PAGE_SIZE_DEFAULT, PAGE_SIZE_MAX
+
+T = TypeVar("T")
+
+# Response header carrying the cursor for the next page; absent on the last page
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+# Sort order when none is asked for (UUIDv7 ids: creation order)
+DEFAULT_SORT = "id"
+
+
+@dataclass(frozen=True, slots=True)
+class Cursor:
+    """Position just past the last row of a page: its sort value and id.
+
+    ``sort`` is the sort the page was taken in, so the cursor can't be
+    replayed against a different ordering. ``value`` is JSON-safe
+    (datetimes as ISO strings) and None for a NULL sort value.
+    """
+
+    sort: str
+    value: Any
+    id: UUID
+
+
+@dataclass(frozen=True, slots=True)
+class PageParams:
+    limit: int
+    sort: str = DEFAULT_SORT
+    after: Cursor | None = None
+
+    @property
+    def descending(self) -> bool:
+        return self.sort.startswith("-")
+
+    @property
+    def sort_key(self) -> str:
+        return self.sort.lstrip("-")
+
+
+@dataclass(frozen=True, slots=True)
+class Page(Generic[T]):
+    items: Sequence[T]
+    next_cursor: str | None = None
+
+
+def encode_cursor(sort: str, value: Any, last_id: UUID) -> str:
+    """Opaque cursor pointing just past the row with ``value`` and ``last_id``."""
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    payload = json.dumps([sort, value, last_id.hex]).encode()
+    return base64.urlsafe_b64encode(payload).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str, sort: str) -> Cursor:
+    try:
+        payload = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        cursor_sort, value, last_id = json.loads(payload)
+        if not isinstance(cursor_sort, str) or not isinstance(last_id, str):
+            raise ValueError("Malformed cursor")
+        decoded = Cursor(cursor_sort, value, UUID(hex=last_id))
+    except (binascii.Error, ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if decoded.sort != sort:
+        raise HTTPException(status_code=400, detail="Cursor is for a different sort")
+    return decoded
+
+
+def page_params(
+    limit: int = Query(PAGE_SIZE_DEFAULT, ge=1, le=PAGE_SIZE_MAX),
+    cursor: str | None = Query(None),
+) -> PageParams:
+    """Dependency for list endpoints in id order: ``?limit=&cursor=``."""
+    return PageParams(
+        limit=limit, after=decode_cursor(cursor, DEFAULT_SORT) if cursor else None
+    )
+
+
+def sorted_page_params(sortable: Iterable[str]) -> Callable[..., PageParams]:
+    """Dependency for list endpoints that also take ``?sort=``.
+
+    ``sort`` is one of ``sortable``, prefixed with ``-`` for descending order.
+    """
+    allowed = sorted({*sortable, *(f"-{key}" for key in sortable)})
+
+    def dependency(
+        limit: int = Query(PAGE_SIZE_DEFAULT, ge=1, le=PAGE_SIZE_MAX),
+        cursor: str | None = Query(None),
+        sort: str = Query(DEFAULT_SORT, description=f"One of: {', '.join(allowed)}"),
+    ) -> PageParams:
+        if sort not in allowed:
+            raise HTTPException(
+                status_code=422, detail=f"sort must be one of: {', '.join(allowed)}"
+            )
+        after = decode_cursor(cursor, sort) if cursor else None
+        return PageParams(limit=limit, sort=sort, after=after)
+
+    return dependency
+
+
+def page_headers(page: Page) -> dict[str, str]:
+    if page.next_cursor is None:
+        return {}
+    return {NEXT_CURSOR_HEADER: page.next_cursor}
+
+
+def page_items(response: Response, page: Page[T]) -> Sequence[T]:
+    """Put the page's next cursor in the response headers and return its items."""
+    response.headers.update(page_headers(page))
+    return page.items
@@ -1,14 +1,21 @@
-import uuid
-from sqlalchemy import Column, DateTime, String, ForeignKey, Boolean, Float
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, DateTime, String, ForeignKey, Boolean, Float, Index
 from sqlalchemy.orm import relationship
 from app.database import Base
+from app.ids import new_id
+from app.types import GUID
 
 
 class Project(Base):
     __tablename__ = "projects"
-
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    # Keyset pagination walks these in id order, for all of a user's projects
+    # or only those of one client, or in deadline order
+    __table_args__ = (
+        Index("ix_projects_user_id_id", "user_id", "id"),
+        Index("ix_projects_user_id_client_id_id", "user_id", "client_id", "id"),
+        Index("ix_projects_user_id_deadline_id", "user_id", "deadline", "id"),
+    )
+
+    id = Column(GUID(), primary_key=True, default=new_id)
     name = Column(String, nullable=False)
     description = Column(String, nullable=True)
     completed = Column(Boolean, nullable=False, default=False)
@@ -22,17 +29,24 @@ class Project(Base):
 
     tasks = relationship("Task", back_populates="project", cascade="all, delete-orphan")
 
-    client_id = Column(UUID(as_uuid=True), ForeignKey("clients.id"), nullable=True)
+    client_id = Column(GUID(), ForeignKey("clients.id"), nullable=True, index=True)
     client = relationship("Client", back_populates="projects")
 
-    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
+    user_id = Column(GUID(), ForeignKey("users.id"), nullable=False)
     user = relationship("User", back_populates="projects")
 
 
 class Task(Base):
     __tablename__ = "tasks"
-
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    # Keyset pagination walks these in id order, for all of a user's tasks or
+    # only those of one project, or in deadline order
+    __table_args__ = (
+        Index("ix_tasks_user_id_id", "user_id", "id"),
+        Index("ix_tasks_user_id_project_id_id", "user_id", "project_id", "id"),
+        Index("ix_tasks_user_id_deadline_id", "user_id", "deadline", "id"),
+    )
+
+    id = Column(GUID(), primary_key=True, default=new_id)
     name = Column(String, nullable=False)
     description = Column(String, nullable=True)
     completed = Column(Boolean, nullable=False, default=False)
@@ -41,8 +55,8 @@ class Task(Base):
 
     deadline = Column(DateTime, nullable=True)
 
-    project_id = Column(UUID(as_uuid=True), ForeignKey("projects.id"), nullable=False)
+    project_id = Column(GUID(), ForeignKey("projects.id"), nullable=False, index=True)
     project = relationship("Project", back_populates="tasks")
 
-    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
+    user_id = Column(GUID(), ForeignKey("users.id"), nullable=False)
     user = relationship("User", back_populates="tasks")
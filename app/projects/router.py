@@ -1,12 +1,15 @@
+from typing import Annotated
 from click import UUID
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.auth.models import User
 from app.projects.schemas import (
     ProjectCreate,
+    ProjectFilter,
     ProjectRead,
     ProjectUpdate,
     TaskCreate,
+    TaskFilter,
     TaskRead,
     TaskUpdate,
 )
@@ -18,22 +21,31 @@ from app.projects.services import (
     update_project,
     delete_project,
     create_task,
-    read_task,
     read_project_tasks,
     read_user_tasks,
     update_task,
     delete_task,
+    project_repository,
+    task_repository,
 )
-from app.database import get_db
+from app.database import get_read_db, get_write_db
+from app.fieldsets import fields_param, sparse_response
+from app.pagination import PageParams, page_params, sorted_page_params
+from app.responses import page_response
 from app.auth.services import get_current_user
 
 router = APIRouter()
 
+project_page_params = sorted_page_params(project_repository.sortable)
+task_page_params = sorted_page_params(task_repository.sortable)
+project_fields = fields_param(ProjectRead)
+task_fields = fields_param(TaskRead)
+
 
 @router.post("/", response_model=ProjectRead)
 async def new_project(
     project_in: ProjectCreate,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_write_db),
     current_user: User = Depends(get_current_user),
 ):
     project = await create_project(db, project_in, user_id=current_user.id)
@@ -43,67 +55,74 @@ async def new_project(
 @router.get("/get/{project_id}", response_model=ProjectRead)
 async def get_project(
     project_id: str,
-    db: AsyncSession = Depends(get_db),
+    response: Response,
+    fields: tuple[str, ...] | None = Depends(project_fields),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
 ):
-    project = await read_project(db, UUID(project_id))
-    if project is None or project.user_id != current_user.id:
-        raise HTTPException(status_code=404, detail="Project not found")
+    project = await read_project(
+        db, UUID(project_id), user_id=current_user.id, fields=fields
+    )
+    if fields:
+        return sparse_response(response, ProjectRead, fields, project)
     return project
 
 
 @router.get("/client/{client_id}", response_model=list[ProjectRead])
 async def list_client_projects(
     client_id: str,
-    db: AsyncSession = Depends(get_db),
+    response: Response,
+    page: PageParams = Depends(page_params),
+    fields: tuple[str, ...] | None = Depends(project_fields),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
 ):
     projects = await read_client_projects(
-        db, client_id=UUID(client_id), user_id=current_user.id
+        db, client_id=UUID(client_id), user_id=current_user.id, page=page, fields=fields
     )
-    return projects
+    return page_response(response, ProjectRead, projects, fields)
 
 
 @router.get("/all/", response_model=list[ProjectRead])
 async def list_projects(
-    db: AsyncSession = Depends(get_db),
+    response: Response,
+    filters: Annotated[ProjectFilter, Query()],
+    page: PageParams = Depends(project_page_params),
+    fields: tuple[str, ...] | None = Depends(project_fields),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
 ):
-    projects = await read_projects(db, user_id=current_user.id)
-    return projects
+    projects = await read_projects(
+        db, user_id=current_user.id, page=page, filters=filters, fields=fields
+    )
+    return page_response(response, ProjectRead, projects, fields)
 
 
 @router.patch("/{project_id}", response_model=ProjectRead)
 async def update_project_endpoint(
     project_id: str,
     project_in: ProjectUpdate,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_write_db),
     current_user: User = Depends(get_current_user),
 ):
-    project = await read_project(db, UUID(project_id))
-    if project is None or project.user_id != current_user.id:
-        raise HTTPException(status_code=404, detail="Project not found")
-    project = await update_project(db, project, project_in)
+    project = await update_project(db, UUID(project_id), current_user.id, project_in)
     return project
 
 
 @router.delete("/{project_id}", response_model=ProjectRead)
 async def delete_project_endpoint(
     project_id: str,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_write_db),
     current_user: User = Depends(get_current_user),
 ):
-    project = await read_project(db, UUID(project_id))
-    if project is None or project.user_id != current_user.id:
-        raise HTTPException(status_code=404, detail="Project not found")
-    project = await delete_project(db, project)
+    project = await delete_project(db, UUID(project_id), user_id=current_user.id)
     return project
 
 
 @router.post("/task/", response_model=TaskRead)
 async def new_task(
     task_in: TaskCreate,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_write_db),
     current_user: User = Depends(get_current_user),
 ):
     task = await create_task(db, task_in, user_id=current_user.id)
@@ -113,44 +132,49 @@ async def new_task(
 @router.get("/get/{project_id}/tasks", response_model=list[TaskRead])
 async def list_project_tasks(
     project_id: str,
-    db: AsyncSession = Depends(get_db),
+    response: Response,
+    page: PageParams = Depends(page_params),
+    fields: tuple[str, ...] | None = Depends(task_fields),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
 ):
-    tasks = await read_project_tasks(db, UUID(project_id), user_id=current_user.id)
-    return tasks
+    tasks = await read_project_tasks(
+        db, UUID(project_id), user_id=current_user.id, page=page, fields=fields
+    )
+    return page_response(response, TaskRead, tasks, fields)
 
 
 @router.get("/task/all/", response_model=list[TaskRead])
 async def list_user_tasks(
-    db: AsyncSession = Depends(get_db),
+    response: Response,
+    filters: Annotated[TaskFilter, Query()],
+    page: PageParams = Depends(task_page_params),
+    fields: tuple[str, ...] | None = Depends(task_fields),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
 ):
-    tasks = await read_user_tasks(db, user_id=current_user.id)
-    return tasks
+    tasks = await read_user_tasks(
+        db, user_id=current_user.id, page=page, filters=filters, fields=fields
+    )
+    return page_response(response, TaskRead, tasks, fields)
 
 
 @router.patch("/task/{task_id}", response_model=TaskRead)
 async def update_task_endpoint(
     task_id: str,
     task_in: TaskUpdate,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_write_db),
     current_user: User = Depends(get_current_user),
 ):
-    task = await read_task(db, UUID(task_id))
-    if task is None or task.user_id != current_user.id:
-        raise HTTPException(status_code=404, detail="Task not found")
-    task = await update_task(db, task, task_in)
+    task = await update_task(db, UUID(task_id), current_user.id, task_in)
     return task
 
 
 @router.delete("/task/{task_id}", response_model=TaskRead)
 async def delete_task_endpoint(
     task_id: str,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_write_db),
     current_user: User = Depends(get_current_user),
 ):
-    task = await read_task(db, UUID(task_id))
-    if task is None or task.user_id != current_user.id:
-        raise HTTPException(status_code=404, detail="Task not found")
-    task = await delete_task(db, task)
+    task = await delete_task(db, UUID(task_id), user_id=current_user.id)
     return task
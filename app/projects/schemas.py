@@ -70,3 +70,21 @@ class TaskRead(TaskBase):
     user_id: UUID
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class ProjectFilter(BaseModel):
+    """Query parameters narrowing the project list; unset fields don't filter."""
+
+    completed: bool | None = None
+    client_id: UUID | None = None
+    deadline_after: datetime | None = None  # Inclusive
+    deadline_before: datetime | None = None  # Exclusive
+
+
+class TaskFilter(BaseModel):
+    """Query parameters narrowing the task list; unset fields don't filter."""
+
+    completed: bool | None = None
+    project_id: UUID | None = None
+    deadline_after: datetime | None = None  # Inclusive
+    deadline_before: datetime | None = None  # Exclusive
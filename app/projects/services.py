@@ -1,98 +1,134 @@
+from typing import Sequence
 from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import delete
+from app.clients.services import client_repository
 from app.projects.models import Project, Task
-from app.projects.schemas import ProjectCreate, ProjectUpdate, TaskCreate, TaskUpdate
+from app.projects.schemas import (
+    ProjectCreate,
+    ProjectFilter,
+    ProjectUpdate,
+    TaskCreate,
+    TaskFilter,
+    TaskUpdate,
+)
+from app.pagination import PageParams
+from app.repository import ScopedRepository
 from sqlalchemy.ext.asyncio import AsyncSession
 
+project_repository = ScopedRepository(
+    Project,
+    not_found="Project not found",
+    sortable=["deadline"],
+    references={"client_id": client_repository},
+)
+task_repository = ScopedRepository(
+    Task,
+    not_found="Task not found",
+    sortable=["deadline"],
+    references={"project_id": project_repository},
+)
+
+
+def _filter_criteria(model, filters: ProjectFilter | TaskFilter) -> list:
+    """SQL criteria for the fields set on ``filters`` (equality, or a deadline window)."""
+    criteria = []
+    for name, value in filters.model_dump(exclude_none=True).items():
+        if name == "deadline_after":
+            criteria.append(model.deadline >= value)
+        elif name == "deadline_before":
+            criteria.append(model.deadline < value)
+        else:
+            criteria.append(getattr(model, name) == value)
+    return criteria
 
-async def create_project(db: AsyncSession, project_in: ProjectCreate, user_id: UUID):
-    project = Project(**project_in.model_dump(), user_id=user_id)
-    db.add(project)
-    await db.commit()
-    await db.refresh(project)
-    return project
-
-
-async def read_project(db: AsyncSession, project_id: UUID):
-    result = await db.get(Project, project_id)
-    return result
 
-
-async def read_projects(db: AsyncSession, user_id: UUID):
-    result = await db.execute(select(Project).where(Project.user_id == user_id))
-    projects = result.scalars().all()
-    return projects
+async def create_project(db: AsyncSession, project_in: ProjectCreate, user_id: UUID):
+    return await project_repository.create(db, user_id, project_in.model_dump())
+
+
+async def read_project(
+    db: AsyncSession,
+    project_id: UUID,
+    user_id: UUID,
+    fields: Sequence[str] | None = None,
+):
+    return await project_repository.get(db, project_id, user_id, columns=fields)
+
+
+async def read_projects(
+    db: AsyncSession,
+    user_id: UUID,
+    page: PageParams,
+    filters: ProjectFilter = ProjectFilter(),
+    fields: Sequence[str] | None = None,
+):
+    return await project_repository.page(
+        db, user_id, page, *_filter_criteria(Project, filters), columns=fields
+    )
 
 
-async def read_client_projects(db: AsyncSession, client_id: UUID | None, user_id: UUID):
-    result = await db.execute(
-        select(Project).where(
-            Project.client_id == client_id,
-            Project.user_id == user_id,
-        )
+async def read_client_projects(
+    db: AsyncSession,
+    client_id: UUID | None,
+    user_id: UUID,
+    page: PageParams,
+    fields: Sequence[str] | None = None,
+):
+    return await project_repository.page(
+        db, user_id, page, Project.client_id == client_id, columns=fields
     )
-    projects = result.scalars().all()
-    return projects
 
 
-async def update_project(db: AsyncSession, project: Project, project_in: ProjectUpdate):
-    for field, value in project_in.model_dump(exclude_unset=True).items():
-        setattr(project, field, value)
-    db.add(project)
-    await db.commit()
-    await db.refresh(project)
-    return project
+async def update_project(
+    db: AsyncSession, project_id: UUID, user_id: UUID, project_in: ProjectUpdate
+):
+    changes = project_in.model_dump(exclude_unset=True)
+    return await project_repository.update(db, project_id, user_id, changes)
 
 
-async def delete_project(db: AsyncSession, project: Project):
-    await db.delete(project)
-    await db.commit()
-    return project
+async def delete_project(db: AsyncSession, project_id: UUID, user_id: UUID):
+    # One bulk statement, so the project's tasks are never loaded
+    delete_tasks = delete(Task).where(
+        Task.project_id.in_(project_repository.owned_ids(project_id, user_id))
+    )
+    return await project_repository.delete(
+        db, project_id, user_id, before=[delete_tasks]
+    )
 
 
 async def create_task(db: AsyncSession, task_in: TaskCreate, user_id: UUID):
-    task = Task(**task_in.model_dump(), user_id=user_id)
-    db.add(task)
-    await db.commit()
-    await db.refresh(task)
-    return task
-
-
-async def read_task(db: AsyncSession, task_id: UUID):
-    result = await db.get(Task, task_id)
-    return result
-
-
-async def read_project_tasks(db: AsyncSession, project_id: UUID, user_id: UUID):
-    result = await db.execute(
-        select(Task).where(
-            Task.project_id == project_id,
-            Task.user_id == user_id,
-        )
+    return await task_repository.create(db, user_id, task_in.model_dump())
+
+
+async def read_project_tasks(
+    db: AsyncSession,
+    project_id: UUID,
+    user_id: UUID,
+    page: PageParams,
+    fields: Sequence[str] | None = None,
+):
+    return await task_repository.page(
+        db, user_id, page, Task.project_id == project_id, columns=fields
     )
-    tasks = result.scalars().all()
-    return tasks
 
 
-async def read_user_tasks(db: AsyncSession, user_id: UUID):
-    result = await db.execute(
-        select(Task).where(Task.user_id == user_id)
+async def read_user_tasks(
+    db: AsyncSession,
+    user_id: UUID,
+    page: PageParams,
+    filters: TaskFilter = TaskFilter(),
+    fields: Sequence[str] | None = None,
+):
+    return await task_repository.page(
+        db, user_id, page, *_filter_criteria(Task, filters), columns=fields
     )
-    tasks = result.scalars().all()
-    return tasks
 
 
-async def update_task(db: AsyncSession, task: Task, task_in: TaskUpdate):
-    for field, value in task_in.model_dump(exclude_unset=True).items():
-        setattr(task, field, value)
-    db.add(task)
-    await db.commit()
-    await db.refresh(task)
-    return task
+async def update_task(db: AsyncSession, task_id: UUID, user_id: UUID, task_in: TaskUpdate):
+    changes = task_in.model_dump(exclude_unset=True)
+    return await task_repository.update(db, task_id, user_id, changes)
 
 
-async def delete_task(db: AsyncSession, task: Task):
-    await db.delete(task)
-    await db.commit()
-    return task
+async def delete_task(db: AsyncSession, task_id: UUID, user_id: UUID):
+    return await task_repository.delete(db, task_id, user_id)
@@ -0,0 +1,257 @@
+from datetime import datetime
+from typing import Any, Generic, Mapping, Sequence, TypeVar
+from uuid import UUID
+from fastapi import HTTPException
+from sqlalchemy import (
+    ColumnElement,
+    DateTime,
+    Executable,
+    Select,
+    delete,
+    insert,
+    select,
+    tuple_,
+    update,
+)
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import run_write
+from app.pagination import DEFAULT_SORT, Cursor, Page, PageParams, encode_cursor
+
+M = TypeVar("M")
+
+
+class ScopedRepository(Generic[M]):
+    """Access to the rows of ``model`` that belong to one user.
+
+    Every statement filters on ``(id, user_id)`` in SQL, so another user's row
+    is never loaded and is indistinguishable from a missing one: both are a 404
+    with ``not_found`` as the detail. Updates and deletes are single
+    ``UPDATE/DELETE ... RETURNING`` statements with no lookup beforehand.
+
+    Pages can be sorted by id or by any column in ``sortable``; each of those
+    should lead a ``(user_id, column, id)`` index.
+
+    ``references`` maps foreign key columns to the repository of the rows they
+    point at. Creates and updates check, in the same transaction, that a
+    referenced row exists and belongs to the same user, and answer with that
+    repository's 404 otherwise.
+    """
+
+    def __init__(
+        self,
+        model: type[M],
+        not_found: str,
+        sortable: Sequence[str] = (),
+        references: Mapping[str, "ScopedRepository"] | None = None,
+    ):
+        self.model = model
+        self.not_found = not_found
+        self.sortable = (DEFAULT_SORT, *sortable)
+        self.references = dict(references or {})
+        self.columns = tuple(model.__table__.columns.keys())
+
+    def _owned(self, id: UUID, user_id: UUID) -> tuple[ColumnElement[bool], ...]:
+        return (self.model.id == id, self.model.user_id == user_id)
+
+    def _missing(self) -> HTTPException:
+        return HTTPException(status_code=404, detail=self.not_found)
+
+    def _select(self, columns: Sequence[str] | None, *required: str) -> Select:
+        """SELECT of whole entities, or of just ``columns`` plus ``required``.
+
+        Columns are taken from the table rather than the mapper, so the rows
+        come back as plain tuples that never touch the identity map.
+        """
+        if columns is None:
+            return select(self.model)
+        names = dict.fromkeys([*required, *columns])
+        return select(*(self.model.__table__.c[name] for name in names))
+
+    async def _check_references(
+        self, session: AsyncSession, user_id: UUID, values: Mapping[str, Any]
+    ):
+        for name, repository in self.references.items():
+            value = values.get(name)
+            if value is None:
+                continue
+            if await session.scalar(repository.owned_ids(value, user_id)) is None:
+                raise repository._missing()
+
+    async def _write(self, db: AsyncSession, op) -> M:
+        """``run_write(db, op)``, with a constraint violation answered as a 400.
+
+        That covers a NULL in a NOT NULL column (the update schemas accept
+        null for any field) as well as a reference whose row went away after
+        the up-front check.
+        """
+        try:
+            return await run_write(db, op)
+        except IntegrityError:
+            raise HTTPException(status_code=400, detail="Constraint violation")
+
+    def owned_ids(self, id: UUID, user_id: UUID) -> Select:
+        """``SELECT id`` matching ``id`` only when ``user_id`` owns it.
+
+        For scoping statements on dependent rows, e.g. in ``delete(before=...)``.
+        """
+        return select(self.model.id).where(*self._owned(id, user_id))
+
+    async def get(
+        self,
+        db: AsyncSession,
+        id: UUID,
+        user_id: UUID,
+        columns: Sequence[str] | None = None,
+    ) -> M:
+        """The row as an entity, or as a column row when ``columns`` narrows it."""
+        result = await db.execute(
+            self._select(columns).where(*self._owned(id, user_id))
+        )
+        obj = result.scalar_one_or_none() if columns is None else result.first()
+        if obj is None:
+            raise self._missing()
+        return obj
+
+    async def page(
+        self,
+        db: AsyncSession,
+        user_id: UUID,
+        params: PageParams,
+        *criteria: ColumnElement[bool],
+        columns: Sequence[str] | None = None,
+    ) -> Page[dict[str, Any]]:
+        """One page of the user's rows matching ``criteria``, in ``params.sort`` order.
+
+        Keyset pagination: the page starts after the cursor's (sort value, id)
+        rather than at an OFFSET, so with a ``(user_id, ..., sort column, id)``
+        index every page costs the same however deep it is. One extra row is
+        fetched to tell whether another page follows.
+
+        Items are plain dicts of column values, not entities: list reads skip
+        ORM hydration and the identity map, and response models validate them
+        as mappings rather than probing attributes. With ``columns``, only
+        those (plus id and the sort column, which the cursor needs) are
+        selected.
+        """
+        column = getattr(self.model, params.sort_key)
+        order = [column.desc() if params.descending else column.asc()]
+        if column is not self.model.id:
+            # Ties on the sort column are broken by id, in the same direction
+            order.append(self.model.id.desc() if params.descending else self.model.id.asc())
+        stmt = (
+            self._select(columns or self.columns, "id", params.sort_key)
+            .where(self.model.user_id == user_id, *criteria)
+            .order_by(*order)
+        )
+
+        rows = []
+        for segment in self._segments(column, params.descending, params.after):
+            result = await db.execute(
+                stmt.where(*segment).limit(params.limit + 1 - len(rows))
+            )
+            rows += [row._asdict() for row in result]
+            if len(rows) > params.limit:
+                break
+        if len(rows) <= params.limit:
+            return Page(rows)
+
+        rows = rows[: params.limit]
+        last = rows[-1]
+        # For id order the id is the whole position
+        value = None if column is self.model.id else last[params.sort_key]
+        return Page(rows, next_cursor=encode_cursor(params.sort, value, last["id"]))
+
+    def _segments(
+        self, column, descending: bool, cursor: Cursor | None
+    ) -> list[list[ColumnElement[bool]]]:
+        """Criteria for the runs of rows still to come, in page order.
+
+        Rows with a NULL sort value come last in either direction. They are
+        fetched as a run of their own, so that each run is a single index
+        range; an ``OR ... IS NULL`` in one query would defeat the index.
+        """
+        id_column = self.model.id
+        if column is id_column:
+            if cursor is None:
+                return [[]]
+            return [[id_column < cursor.id if descending else id_column > cursor.id]]
+
+        if cursor is None:
+            return [[column.is_not(None)], [column.is_(None)]]
+        if cursor.value is None:
+            past = id_column < cursor.id if descending else id_column > cursor.id
+            return [[column.is_(None), past]]
+
+        value = cursor.value
+        if isinstance(column.type, DateTime):
+            try:
+                value = datetime.fromisoformat(value)
+            except (TypeError, ValueError):
+                raise HTTPException(status_code=400, detail="Invalid cursor")
+        position = tuple_(column, id_column)
+        past = position < (value, cursor.id) if descending else position > (value, cursor.id)
+        return [[past], [column.is_(None)]]
+
+    async def create(self, db: AsyncSession, user_id: UUID, values: dict[str, Any]) -> M:
+        async def op(session: AsyncSession):
+            await self._check_references(session, user_id, values)
+            return await session.scalar(
+                insert(self.model).values(**values, user_id=user_id).returning(self.model)
+            )
+
+        return await self._write(db, op)
+
+    async def update(
+        self, db: AsyncSession, id: UUID, user_id: UUID, changes: dict[str, Any]
+    ) -> M:
+        if not changes:
+            return await self.get(db, id, user_id)
+
+        async def op(session: AsyncSession):
+            await self._check_references(session, user_id, changes)
+            return await session.scalar(
+                update(self.model)
+                .where(*self._owned(id, user_id))
+                .values(**changes)
+                .returning(self.model)
+                .execution_options(populate_existing=True)
+            )
+
+        obj = await self._write(db, op)
+        if obj is None:
+            raise self._missing()
+        return obj
+
+    async def delete(
+        self,
+        db: AsyncSession,
+        id: UUID,
+        user_id: UUID,
+        before: Sequence[Executable] = (),
+    ) -> M:
+        """Delete the row and return it as it was.
+
+        ``before`` runs first in the same transaction, for dependent rows that
+        would otherwise block the delete; scope them with ``owned_ids`` so they
+        are no-ops when the row isn't the user's.
+        """
+
+        async def op(session: AsyncSession):
+            for statement in before:
+                await session.execute(statement)
+            obj = await session.scalar(
+                delete(self.model)
+                .where(*self._owned(id, user_id))
+                .returning(self.model)
+            )
+            # RETURNING loads the row as a new persistent instance; the session
+            # must not go on treating it as a live row
+            if obj is not None:
+                session.expunge(obj)
+            return obj
+
+        obj = await run_write(db, op)
+        if obj is None:
+            raise self._missing()
+        return obj
@@ -0,0 +1,52 @@
+from functools import lru_cache
+from typing import Any
+from fastapi import Response
+from pydantic import BaseModel, TypeAdapter
+from app.config import SERIALIZE_ONCE
+from app.fieldsets import forward_headers, sparse_response
+from app.pagination import Page, page_headers, page_items
+
+
+@lru_cache(maxsize=None)
+def response_adapter(schema: type[BaseModel], many: bool) -> TypeAdapter:
+    """Built once per schema: compiling the validator and serializer is the slow part."""
+    return TypeAdapter(list[schema] if many else schema)
+
+
+def json_response(
+    response: Response,
+    schema: type[BaseModel],
+    content: Any,
+    headers: dict[str, str] | None = None,
+) -> Response:
+    """JSON response for one row or a list, validated and serialized in one pass.
+
+    FastAPI's own path for ``response_model`` validates, dumps to JSON-able
+    Python and then runs that through ``json.dumps``; here pydantic writes
+    the bytes directly. Returning a Response skips ``response_model``
+    entirely, so it still only documents the schema; headers set on the
+    injected ``response`` are carried over.
+    """
+    adapter = response_adapter(schema, isinstance(content, (list, tuple)))
+    body = adapter.dump_json(adapter.validate_python(content, from_attributes=True))
+    return forward_headers(
+        response, Response(content=body, media_type="application/json", headers=headers)
+    )
+
+
+def page_response(
+    response: Response,
+    schema: type[BaseModel],
+    page: Page,
+    fields: tuple[str, ...] | None = None,
+) -> Any:
+    """What a list endpoint returns for ``page``: its items as ``schema``.
+
+    Only ``fields`` of them when given; serialized here when SERIALIZE_ONCE is
+    on; otherwise the items themselves, for ``response_model`` to handle.
+    """
+    if fields:
+        return sparse_response(response, schema, fields, page.items, page_headers(page))
+    if SERIALIZE_ONCE:
+        return json_response(response, schema, page.items, page_headers(page))
+    return page_items(response, page)
@@ -0,0 +1,40 @@
+import uuid
+from sqlalchemy import LargeBinary
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.types import TypeDecorator
+
+
+class GUID(TypeDecorator):
+    """UUID column: native ``uuid`` on Postgres, 16-byte BLOB everywhere else.
+
+    ``postgresql.UUID`` falls back to 32-character hex text on SQLite, which
+    doubles the size of every key and every index entry that holds one.
+    """
+
+    impl = LargeBinary(16)
+    cache_ok = True
+
+    def load_dialect_impl(self, dialect):
+        if dialect.name == "postgresql":
+            return dialect.type_descriptor(postgresql.UUID(as_uuid=True))
+        return dialect.type_descriptor(LargeBinary(16))
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        if not isinstance(value, uuid.UUID):
+            value = uuid.UUID(str(value))
+        if dialect.name == "postgresql":
+            return value
+        return value.bytes
+
+    def process_result_value(self, value, dialect):
+        # Checked in order of frequency: this runs for every key of every row
+        if type(value) is bytes:
+            return uuid.UUID(bytes=value)
+        if value is None or isinstance(value, uuid.UUID):
+            return value
+        if isinstance(value, str):
+            # Rows written before the binary migration ran
+            return uuid.UUID(value)
+        return uuid.UUID(bytes=bytes(value))
@@ -0,0 +1,124 @@
+"""Per-row CPU time and memory of a task listing: ORM entities vs Core reads.
+
+Usage:
+    python -m benchmarks.bench_list_reads [--rows 10000] [--repeat 5]
+
+A throwaway SQLite file is filled with ``--rows`` tasks for one user. Each
+strategy then reads them all and produces the response body the way FastAPI
+does for ``response_model=list[TaskRead]``: validate from attributes, dump to
+JSON-able Python, json.dumps.
+
+    orm   select(Task) entities, hydrated into the session (the old list path)
+    rows  table columns as plain Row tuples, validated from attributes
+    dicts ScopedRepository.page: the same columns as dicts (the list path now)
+
+Time is the best of ``--repeat`` runs; memory is the tracemalloc peak of one run.
+"""
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+import uuid
+from pydantic import TypeAdapter
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from app.auth.models import User
+from app.migrations import run_migrations
+from app.pagination import PageParams
+from app.projects.models import Project, Task
+from app.projects.schemas import TaskRead
+from app.projects.services import task_repository
+
+adapter = TypeAdapter(list[TaskRead])
+
+
+def render(items) -> bytes:
+    validated = adapter.validate_python(items, from_attributes=True)
+    return json.dumps(adapter.dump_python(validated, mode="json")).encode()
+
+
+async def orm(session_factory, user_id, rows):
+    async with session_factory() as db:
+        result = await db.execute(select(Task).where(Task.user_id == user_id))
+        return render(result.scalars().all())
+
+
+async def core_rows(session_factory, user_id, rows):
+    async with session_factory() as db:
+        result = await db.execute(
+            select(*Task.__table__.columns).where(Task.user_id == user_id)
+        )
+        return render(result.all())
+
+
+async def core_dicts(session_factory, user_id, rows):
+    async with session_factory() as db:
+        page = await task_repository.page(db, user_id, PageParams(limit=rows))
+        return render(page.items)
+
+
+STRATEGIES = {"orm": orm, "rows": core_rows, "dicts": core_dicts}
+
+
+async def measure(strategy, session_factory, user_id, rows, repeat):
+    body = await strategy(session_factory, user_id, rows)  # warm caches
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        await strategy(session_factory, user_id, rows)
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    await strategy(session_factory, user_id, rows)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak, len(body)
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_async_engine(f"sqlite+aiosqlite:///{os.path.join(tmp, 'b.db')}")
+        async with engine.begin() as conn:
+            await conn.run_sync(run_migrations)
+            user_id, project_id = uuid.uuid4(), uuid.uuid4()
+            await conn.execute(
+                insert(User).values(id=user_id, username="bench", hashed_password="x")
+            )
+            await conn.execute(
+                insert(Project).values(id=project_id, name="bench", user_id=user_id)
+            )
+            await conn.execute(
+                insert(Task),
+                [
+                    {
+                        "name": f"task {i}",
+                        "description": "lorem ipsum " * 8,
+                        "project_id": project_id,
+                        "user_id": user_id,
+                    }
+                    for i in range(args.rows)
+                ],
+            )
+        session_factory = async_sessionmaker(bind=engine, expire_on_commit=False)
+
+        for name, strategy in STRATEGIES.items():
+            elapsed, peak, size = await measure(
+                strategy, session_factory, user_id, args.rows, args.repeat
+            )
+            print(
+                f"{name:<6} {elapsed * 1e6 / args.rows:7.2f} us/row"
+                f"  {peak / args.rows:8.0f} B/row peak  ({size} byte body)"
+            )
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
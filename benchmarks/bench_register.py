@@ -0,0 +1,84 @@
+"""Registrations per second: check-then-insert vs single INSERT ... RETURNING.
+
+Usage:
+    python -m benchmarks.bench_register [--users 2000] [--with-hashing]
+
+Runs against a throwaway SQLite file. By default password hashing is replaced
+by a constant so the numbers isolate the database round trips; pass
+--with-hashing to include bcrypt at the configured cost.
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+import uuid
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from app.auth import models, services
+from app.auth.schemas import UserCreate
+from app.database import Base
+import app.models  # noqa: F401
+
+
+async def legacy_create_user(db: AsyncSession, user_in: UserCreate, hashed: str):
+    """The pre-RETURNING implementation: SELECT, INSERT, COMMIT, refresh SELECT."""
+    result = await db.execute(
+        select(models.User).where(models.User.username == user_in.username)
+    )
+    if result.scalar_one_or_none():
+        raise ValueError("Username already registered")
+    db_user = models.User(
+        id=uuid.uuid4(), username=user_in.username, hashed_password=hashed
+    )
+    db.add(db_user)
+    await db.commit()
+    await db.refresh(db_user)
+    return db_user
+
+
+class _ConstantHasher:
+    async def hash(self, password: str) -> str:
+        return "not-a-real-hash"
+
+
+async def run(label: str, users: int, create) -> float:
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_async_engine(f"sqlite+aiosqlite:///{os.path.join(tmp, 'b.db')}")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        session_factory = async_sessionmaker(bind=engine, expire_on_commit=False)
+
+        start = time.perf_counter()
+        async with session_factory() as db:
+            for i in range(users):
+                await create(db, UserCreate(username=f"user{i}", password="secret"))
+        elapsed = time.perf_counter() - start
+        await engine.dispose()
+
+    rate = users / elapsed
+    print(f"{label:<22} {users} users in {elapsed:6.2f}s  {rate:8.0f} registrations/s")
+    return rate
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=2000)
+    parser.add_argument("--with-hashing", action="store_true")
+    args = parser.parse_args()
+
+    if args.with_hashing:
+        hasher = services.password_hasher
+    else:
+        hasher = services.password_hasher = _ConstantHasher()
+
+    async def legacy(db, user_in):
+        return await legacy_create_user(db, user_in, await hasher.hash(user_in.password))
+
+    before = await run("check-then-insert", args.users, legacy)
+    after = await run("insert ... returning", args.users, services.create_user)
+    print(f"speedup: {after / before:.2f}x")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,123 @@
+"""Per-row cost of turning a list page into a JSON response body.
+
+Usage:
+    python -m benchmarks.bench_responses [--rows 10000] [--repeat 5]
+
+Pages of ``--rows`` column dicts, as ScopedRepository.page returns them, are
+rendered for each of ClientRead, ProjectRead and TaskRead:
+
+    fastapi  what FastAPI does for ``response_model=list[Schema]``: validate,
+             dump to JSON-able Python, then JSONResponse (json.dumps)
+    once     app.responses.json_response: validate, then pydantic writes the
+             bytes directly (SERIALIZE_ONCE)
+    orjson   validate, dump to Python, orjson.dumps; only if orjson is installed
+
+Time is the best of ``--repeat`` runs; memory is the tracemalloc peak of one run.
+"""
+import argparse
+import asyncio
+import time
+import tracemalloc
+import uuid
+from datetime import datetime, timedelta
+from fastapi import Response
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+from app.clients.schemas import ClientRead
+from app.projects.schemas import ProjectRead, TaskRead
+from app.responses import json_response, response_adapter
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+NOW = datetime(2030, 1, 1, 12, 30)
+
+
+def make_rows(schema, rows: int) -> list[dict]:
+    user_id, parent_id = uuid.uuid4(), uuid.uuid4()
+    values = {
+        "id": uuid.uuid4,
+        "user_id": lambda: user_id,
+        "client_id": lambda: parent_id,
+        "project_id": lambda: parent_id,
+        "name": lambda: "Acme redesign",
+        "description": lambda: "lorem ipsum " * 8,
+        "notes": lambda: "net 30",
+        "rate": lambda: 95.0,
+        "hours_worked": lambda: 12.5,
+        "completed": lambda: False,
+        "completed_on": lambda: None,
+        "deadline": lambda: NOW + timedelta(days=7),
+        "use_client_rate": lambda: True,
+        "use_task_hours": lambda: True,
+    }
+    return [{name: values[name]() for name in schema.model_fields} for _ in range(rows)]
+
+
+def fastapi_path(schema):
+    field = create_model_field("Response", list[schema], mode="serialization")
+
+    async def render(items) -> bytes:
+        content = await serialize_response(field=field, response_content=items)
+        return JSONResponse(content).body
+
+    return render
+
+
+def once_path(schema):
+    async def render(items) -> bytes:
+        return json_response(Response(), schema, items).body
+
+    return render
+
+
+def orjson_path(schema):
+    adapter = response_adapter(schema, True)
+
+    async def render(items) -> bytes:
+        return orjson.dumps(adapter.dump_python(adapter.validate_python(items)))
+
+    return render
+
+
+STRATEGIES = {"fastapi": fastapi_path, "once": once_path}
+if orjson is not None:
+    STRATEGIES["orjson"] = orjson_path
+
+
+async def measure(render, items, repeat):
+    body = await render(items)  # warm caches
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        await render(items)
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    await render(items)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak, len(body)
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    for schema in (ClientRead, ProjectRead, TaskRead):
+        items = make_rows(schema, args.rows)
+        for name, strategy in STRATEGIES.items():
+            elapsed, peak, size = await measure(strategy(schema), items, args.repeat)
+            print(
+                f"{schema.__name__:<12} {name:<8} {elapsed * 1e6 / args.rows:6.2f} us/row"
+                f"  {peak / args.rows:7.0f} B/row peak  ({size} byte body)"
+            )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,72 @@
+"""Compare SQLite PRAGMA profiles on single-row commits and list reads.
+
+Usage:
+    python -m benchmarks.bench_sqlite_profiles [--tasks 2000] [--reads 500]
+
+For each profile in app.database.SQLITE_PROFILES (plus the untuned SQLite
+defaults), a throwaway database is migrated, then ``--tasks`` tasks are
+inserted with one commit each (the API's write pattern), then a user's task
+list is read ``--reads`` times.
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+import uuid
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from app.auth.models import User
+from app.database import SQLITE_PROFILES, apply_sqlite_pragmas
+from app.migrations import run_migrations
+from app.projects.models import Project, Task
+
+
+async def run(label: str, pragmas: dict | None, tasks: int, reads: int):
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_async_engine(f"sqlite+aiosqlite:///{os.path.join(tmp, 'b.db')}")
+        if pragmas is not None:
+            apply_sqlite_pragmas(engine, pragmas)
+        async with engine.begin() as conn:
+            await conn.run_sync(run_migrations)
+        session_factory = async_sessionmaker(bind=engine, expire_on_commit=False)
+
+        user_id, project_id = uuid.uuid4(), uuid.uuid4()
+        async with session_factory() as db:
+            db.add(User(id=user_id, username="bench", hashed_password="x"))
+            db.add(Project(id=project_id, name="bench", user_id=user_id))
+            await db.commit()
+
+            start = time.perf_counter()
+            for i in range(tasks):
+                db.add(Task(name=f"task {i}", project_id=project_id, user_id=user_id))
+                await db.commit()
+            write_elapsed = time.perf_counter() - start
+
+            start = time.perf_counter()
+            for _ in range(reads):
+                db.expunge_all()
+                result = await db.execute(select(Task).where(Task.user_id == user_id))
+                result.scalars().all()
+            read_elapsed = time.perf_counter() - start
+        await engine.dispose()
+
+    print(
+        f"{label:<12} {tasks / write_elapsed:9.0f} commits/s"
+        f"  {reads / read_elapsed:7.1f} list reads/s"
+    )
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=2000)
+    parser.add_argument("--reads", type=int, default=500)
+    args = parser.parse_args()
+
+    await run("defaults", None, args.tasks, args.reads)
+    for name, pragmas in SQLITE_PROFILES.items():
+        await run(name, pragmas, args.tasks, args.reads)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
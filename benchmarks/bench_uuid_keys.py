@@ -0,0 +1,84 @@
+"""Insert throughput and file size for UUID key types and storage formats.
+
+Usage:
+    python -m benchmarks.bench_uuid_keys [--rows 3000000] [--batch 10000]
+
+Builds a tasks-shaped table (primary key plus indexed user_id/project_id
+foreign keys) in a throwaway SQLite file for each combination of key type
+(UUIDv4, UUIDv7) and storage format: 32-character hex text, as
+``postgresql.UUID`` stored them on SQLite, and the 16-byte blobs app.types.GUID
+stores now. Rows go in with executemany, one commit per batch, so the numbers
+isolate B-tree page splits and key size from ORM overhead.
+"""
+import argparse
+import os
+import sqlite3
+import tempfile
+import time
+import uuid
+from app.ids import uuid7
+
+SCHEMA = [
+    """CREATE TABLE tasks (
+        id CHAR(32) PRIMARY KEY,
+        name VARCHAR NOT NULL,
+        project_id CHAR(32) NOT NULL,
+        user_id CHAR(32) NOT NULL
+    )""",
+    "CREATE INDEX ix_tasks_project_id ON tasks (project_id)",
+    "CREATE INDEX ix_tasks_user_id_project_id ON tasks (user_id, project_id)",
+]
+
+
+ENCODINGS = {"hex": lambda value: value.hex, "blob": lambda value: value.bytes}
+
+
+def run(label: str, make_id, encode, rows: int, batch: int):
+    users = [encode(uuid.uuid4()) for _ in range(100)]
+    projects = [encode(uuid.uuid4()) for _ in range(1000)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "keys.db")
+        conn = sqlite3.connect(path)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        for statement in SCHEMA:
+            conn.execute(statement)
+
+        start = last = time.perf_counter()
+        for offset in range(0, rows, batch):
+            conn.executemany(
+                "INSERT INTO tasks VALUES (?, ?, ?, ?)",
+                (
+                    (encode(make_id()), "task", projects[i % 1000], users[i % 100])
+                    for i in range(offset, min(offset + batch, rows))
+                ),
+            )
+            conn.commit()
+            # Progress every ~10% shows whether throughput degrades as it grows
+            if (offset // batch) % max(1, rows // batch // 10) == 0 and offset:
+                now = time.perf_counter()
+                print(f"  {label} {offset:>9} rows  {batch / (now - last):9.0f} rows/s (last batch)")
+            last = time.perf_counter()
+        elapsed = time.perf_counter() - start
+
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        conn.close()
+        size_mb = os.path.getsize(path) / 1024 / 1024
+
+    print(f"{label:<10} {rows / elapsed:9.0f} rows/s overall, {size_mb:8.1f} MiB on disk")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=3_000_000)
+    parser.add_argument("--batch", type=int, default=10_000)
+    args = parser.parse_args()
+
+    for encoding, encode in ENCODINGS.items():
+        run(f"uuid4/{encoding}", uuid.uuid4, encode, args.rows, args.batch)
+        run(f"uuid7/{encoding}", uuid7, encode, args.rows, args.batch)
+
+
+if __name__ == "__main__":
+    main()
@@ -120,6 +120,61 @@ class TestLoginEndpoint:
         assert "HttpOnly" in set_cookie_header
         assert "SameSite" in set_cookie_header  # Can be SameSite=strict or SameSite=Strict
 
+    def test_login_rehashes_in_own_session(self, client_with_auth, monkeypatch):
+        """Test that the post-response rehash doesn't rely on the request's sessions."""
+        import asyncio
+        from sqlalchemy import select
+        from sqlalchemy.ext.asyncio import async_sessionmaker
+        from app.auth import services
+        from app.auth.hashing import build_context
+        from app.auth.models import User
+
+        context = build_context(rounds=4)
+        monkeypatch.setattr(services, "pwd_context", context)
+        monkeypatch.setattr(services.password_hasher, "context", context)
+        opened = []
+
+        def test_write_session():
+            session = async_sessionmaker(bind=client_with_auth.test_engine)()
+            opened.append(session)
+            return session
+
+        monkeypatch.setattr(services, "write_session", test_write_session)
+
+        response = client_with_auth.post(
+            "/auth/token",
+            data={"username": "testuser", "password": "testpass123"},
+        )
+
+        async def stored_hash():
+            async with client_with_auth.test_engine.connect() as conn:
+                return await conn.scalar(
+                    select(User.hashed_password).where(User.username == "testuser")
+                )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert len(opened) == 1
+        assert asyncio.run(stored_hash()).startswith("$2b$04$")
+
+    def test_login_throttled_after_burst(self, client_with_auth):
+        """Test that repeated failed logins for one username return 429."""
+        from app.config import LOGIN_USER_BURST
+
+        for _ in range(LOGIN_USER_BURST):
+            response = client_with_auth.post(
+                "/auth/token",
+                data={"username": "testuser", "password": "wrongpassword"},
+            )
+            assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+        response = client_with_auth.post(
+            "/auth/token",
+            data={"username": "testuser", "password": "wrongpassword"},
+        )
+
+        assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+        assert "Retry-After" in response.headers
+
 
 class TestGetMeEndpoint:
     """Test get current user endpoint."""
@@ -161,6 +216,69 @@ class TestGetMeEndpoint:
         assert response.status_code == status.HTTP_401_UNAUTHORIZED
 
 
+class TestSlidingRenewal:
+    """Test transparent access-token renewal."""
+
+    def test_fresh_token_is_not_renewed(self, client_with_auth):
+        """Test that a newly issued token does not trigger a new cookie."""
+        response = client_with_auth.get(
+            "/auth/me", cookies={"access_token": client_with_auth.test_token}
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert "access_token" not in response.headers.get("set-cookie", "")
+
+    def test_aging_token_is_renewed(self, client_with_auth, aging_token):
+        """Test that a token past the renewal threshold gets a fresh cookie."""
+        from app.auth.services import decode_access_token
+
+        old_token = aging_token(jti="aging-token", sid="session-1")
+
+        response = client_with_auth.get("/auth/me", cookies={"access_token": old_token})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert "HttpOnly" in response.headers["set-cookie"]
+        new_claims = decode_access_token(response.cookies["access_token"])
+        old_claims = decode_access_token(old_token)
+        assert new_claims["sub"] == str(client_with_auth.test_user.id)
+        assert new_claims["jti"] != "aging-token"
+        assert new_claims["exp"] > old_claims["exp"]
+        assert new_claims["sid"] == "session-1"
+        assert new_claims["auth_time"] == old_claims["auth_time"]
+
+    def test_session_past_max_age_is_not_renewed(self, client_with_auth, aging_token):
+        """Test that renewal stops SESSION_MAX_AGE after the login."""
+        from app.config import SESSION_MAX_AGE
+
+        old_token = aging_token(session_age=SESSION_MAX_AGE + 60)
+
+        response = client_with_auth.get("/auth/me", cookies={"access_token": old_token})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert "access_token" not in response.headers.get("set-cookie", "")
+
+    def test_renewal_never_outlives_session(self, client_with_auth, aging_token):
+        """Test that a renewed token expires when its session reaches SESSION_MAX_AGE."""
+        from app.auth.services import decode_access_token
+        from app.config import SESSION_MAX_AGE
+
+        old_token = aging_token(session_age=SESSION_MAX_AGE - 60)
+
+        response = client_with_auth.get("/auth/me", cookies={"access_token": old_token})
+
+        new_claims = decode_access_token(response.cookies["access_token"])
+        assert new_claims["exp"] <= new_claims["auth_time"] + SESSION_MAX_AGE
+
+    def test_token_without_session_is_not_renewed(self, client_with_auth, aging_token):
+        """Test that tokens without sid/auth_time just run out."""
+        old_token = aging_token(session=False)
+
+        response = client_with_auth.get("/auth/me", cookies={"access_token": old_token})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert "access_token" not in response.headers.get("set-cookie", "")
+
+
 class TestLogoutEndpoint:
     """Test logout endpoint."""
 
@@ -191,6 +309,41 @@ class TestLogoutEndpoint:
         assert "access_token" in set_cookie_header
         assert ("Max-Age=0" in set_cookie_header or "max-age=0" in set_cookie_header)
 
+    def test_logout_revokes_token(self, client_with_auth):
+        """Test that a token presented at logout is rejected afterwards."""
+        token = client_with_auth.test_token
+        response = client_with_auth.get("/auth/me", cookies={"access_token": token})
+        assert response.status_code == status.HTTP_200_OK
+
+        client_with_auth.post("/auth/logout", cookies={"access_token": token})
+
+        response = client_with_auth.get("/auth/me", cookies={"access_token": token})
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_logout_revokes_whole_session(self, client_with_auth, aging_token):
+        """Test that logging out with a renewed token also kills the token it replaced."""
+        old_token = aging_token()
+        renewed = client_with_auth.get(
+            "/auth/me", cookies={"access_token": old_token}
+        ).cookies["access_token"]
+
+        client_with_auth.post("/auth/logout", cookies={"access_token": renewed})
+
+        for token in (old_token, renewed):
+            response = client_with_auth.get("/auth/me", cookies={"access_token": token})
+            assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_logout_leaves_other_sessions(self, client_with_auth, aging_token):
+        """Test that logout only revokes the session it was called with."""
+        other = aging_token()
+
+        client_with_auth.post(
+            "/auth/logout", cookies={"access_token": client_with_auth.test_token}
+        )
+
+        response = client_with_auth.get("/auth/me", cookies={"access_token": other})
+        assert response.status_code == status.HTTP_200_OK
+
     def test_logout_without_login(self, client_with_auth):
         """Test that logout works even without being logged in."""
         # Logout without logging in first
@@ -1,3 +1,4 @@
+import uuid
 import pytest
 from fastapi import status, HTTPException
 from app.auth.services import (
@@ -76,3 +77,409 @@ class TestGetCurrentUser:
             await get_current_user(access_token=expired_token, db=test_db)
         
         assert exc_info.value.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+class TestPasswordHasher:
+    """Test the bounded password hashing pool."""
+
+    @pytest.mark.asyncio
+    async def test_hash_and_verify_off_loop(self):
+        """Test that hashing through the pool round-trips with verify."""
+        from app.auth.hashing import password_hasher
+
+        hashed = await password_hasher.hash("mypassword123")
+        assert await password_hasher.verify("mypassword123", hashed) is True
+        assert await password_hasher.verify("wrongpassword", hashed) is False
+
+    @pytest.mark.asyncio
+    async def test_saturated_pool_returns_503(self):
+        """Test that a caller waiting past the queue timeout gets a 503."""
+        import asyncio
+        import threading
+        from app.auth.hashing import PasswordHasher, pwd_context
+
+        hasher = PasswordHasher(pwd_context, max_workers=1, queue_timeout=0.05)
+        release = threading.Event()
+        busy = asyncio.ensure_future(hasher.run(release.wait))
+        await asyncio.sleep(0.01)
+
+        try:
+            with pytest.raises(HTTPException) as exc_info:
+                await hasher.hash("mypassword123")
+            assert exc_info.value.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+        finally:
+            release.set()
+            await busy
+            hasher.shutdown()
+
+
+class TestPrincipalCache:
+    """Test the authenticated-principal cache."""
+
+    def test_ttl_cache_expires_entries(self):
+        """Test that entries past their TTL are dropped."""
+        from app.auth.cache import TTLCache
+
+        cache = TTLCache(maxsize=10, ttl=60)
+        cache.set("fresh", 1)
+        cache.set("stale", 2, ttl=-1)
+        assert cache.get("fresh") == 1
+        assert cache.get("stale") is None
+
+    def test_ttl_cache_evicts_least_recently_used(self):
+        """Test that the oldest untouched entry is evicted at capacity."""
+        from app.auth.cache import TTLCache
+
+        cache = TTLCache(maxsize=2, ttl=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+        assert cache.get("a") == 1
+        assert cache.get("b") is None
+        assert cache.get("c") == 3
+
+    @pytest.mark.asyncio
+    async def test_get_current_user_returns_cached_principal(
+        self, test_db, test_user, test_user_token
+    ):
+        """Test that a repeat lookup is served from the cache."""
+        from app.auth.schemas import Principal
+        from app.auth.services import get_current_user, principal_cache
+
+        principal_cache.invalidate(test_user.id)
+        first = await get_current_user(access_token=test_user_token, db=test_db)
+        assert isinstance(first, Principal)
+        assert first.id == test_user.id
+        assert first.username == test_user.username
+
+        # A cache hit must not need the session at all
+        second = await get_current_user(access_token=test_user_token, db=None)
+        assert second is first
+
+    @pytest.mark.asyncio
+    async def test_deleted_user_is_evicted(self, test_db, test_user, test_user_token):
+        """Test that deleting a user invalidates its cached principal."""
+        from app.auth.services import get_current_user, principal_cache
+
+        await get_current_user(access_token=test_user_token, db=test_db)
+        assert principal_cache.get(test_user.id) is not None
+
+        await test_db.delete(test_user)
+        await test_db.commit()
+
+        assert principal_cache.get(test_user.id) is None
+        with pytest.raises(HTTPException) as exc_info:
+            await get_current_user(access_token=test_user_token, db=test_db)
+        assert exc_info.value.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+class TestTokenCache:
+    """Test the verified-JWT cache."""
+
+    def test_repeat_decode_is_a_cache_hit(self):
+        """Test that a token is only verified once while it is valid."""
+        from datetime import timedelta
+        from app.auth.services import (
+            create_access_token,
+            decode_access_token,
+            token_cache,
+        )
+
+        token = create_access_token(
+            data={"sub": "some-user-id"}, expires_delta=timedelta(minutes=5)
+        )
+        hits, misses = token_cache.hits, token_cache.misses
+
+        first = decode_access_token(token)
+        second = decode_access_token(token)
+
+        assert first == second
+        assert first["sub"] == "some-user-id"
+        assert token_cache.misses == misses + 1
+        assert token_cache.hits == hits + 1
+
+    def test_expired_token_is_not_cached(self):
+        """Test that an expired token is rejected and never cached."""
+        from datetime import timedelta
+        from jose import JWTError
+        from app.auth.services import create_access_token, decode_access_token, token_cache
+
+        token = create_access_token(
+            data={"sub": "some-user-id"}, expires_delta=timedelta(minutes=-1)
+        )
+        size = len(token_cache)
+
+        with pytest.raises(JWTError):
+            decode_access_token(token)
+        assert len(token_cache) == size
+
+
+class TestClaimsMode:
+    """Test claims-only authentication."""
+
+    @pytest.mark.asyncio
+    async def test_claims_token_needs_no_database(self, monkeypatch):
+        """Test that a claims-mode token resolves to a principal without a query."""
+        from datetime import timedelta
+        from app.auth import services
+        from app.auth.models import User
+        from app.auth.schemas import Principal
+
+        monkeypatch.setattr(services, "AUTH_CLAIMS_MODE", True)
+        user = User(id=uuid.uuid4(), username="claimsuser")
+        token = services.create_access_token(
+            data=services.build_token_claims(user),
+            expires_delta=timedelta(minutes=5),
+        )
+
+        principal = await services.get_current_user(access_token=token, db=None)
+
+        assert principal == Principal(id=user.id, username="claimsuser")
+
+    def test_claims_omitted_by_default(self):
+        """Test that tokens only carry the subject outside claims mode."""
+        from app.auth.models import User
+        from app.auth.services import build_token_claims
+
+        user = User(id=uuid.uuid4(), username="plainuser")
+        assert build_token_claims(user) == {"sub": str(user.id)}
+
+
+class TestLoginThrottle:
+    """Test the login token-bucket limiter."""
+
+    def test_bucket_refills_over_time(self):
+        """Test that a drained bucket regains tokens at the configured rate."""
+        from app.auth.throttle import TokenBucketLimiter
+
+        limiter = TokenBucketLimiter(rate=1.0, burst=2, max_keys=10)
+        limiter.consume("key", now=0.0)
+        limiter.consume("key", now=0.0)
+        assert limiter.retry_after("key", now=0.0) == pytest.approx(1.0)
+        assert limiter.retry_after("key", now=1.0) == 0.0
+
+    def test_rejection_does_not_spend_tokens(self):
+        """Test that an attempt blocked by one bucket leaves the other untouched."""
+        from app.auth.throttle import LoginThrottle, TokenBucketLimiter
+
+        throttle = LoginThrottle(
+            by_username=TokenBucketLimiter(rate=0.0, burst=1, max_keys=10),
+            by_ip=TokenBucketLimiter(rate=0.0, burst=5, max_keys=10),
+        )
+        throttle.check("alice", "10.0.0.1")
+
+        with pytest.raises(HTTPException) as exc_info:
+            throttle.check("alice", "10.0.0.1")
+        assert exc_info.value.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+
+        # The IP bucket still has four tokens for other usernames
+        for name in ["bob", "carol", "dave", "erin"]:
+            throttle.check(name, "10.0.0.1")
+
+
+class TestBcryptCost:
+    """Test bcrypt cost calibration and rehash on login."""
+
+    def test_calibrate_stays_within_budget(self):
+        """Test that calibration never picks a cost slower than the budget."""
+        from app.auth.calibrate import MIN_ROUNDS, calibrate
+
+        chosen, timings = calibrate(budget_ms=50, samples=1)
+        assert chosen >= MIN_ROUNDS
+        assert chosen == MIN_ROUNDS or timings[chosen] <= 50
+
+    @pytest.mark.asyncio
+    async def test_login_rehashes_outdated_hash(self, test_db, test_user, monkeypatch):
+        """Test that a hash made with an old cost is replaced after login."""
+        from fastapi import BackgroundTasks
+        from fastapi.security import OAuth2PasswordRequestForm
+        from sqlalchemy.ext.asyncio import async_sessionmaker
+        from app.auth import services
+        from app.auth.hashing import build_context
+
+        old_hash = test_user.hashed_password
+        # Pretend the deployment was recalibrated to a different cost; the
+        # login check and the hasher share one context, as they do in app.auth
+        context = build_context(rounds=4)
+        monkeypatch.setattr(services, "pwd_context", context)
+        monkeypatch.setattr(services.password_hasher, "context", context)
+        # The rehash opens its own session; point it at the test database
+        monkeypatch.setattr(
+            services, "write_session", async_sessionmaker(bind=test_db.bind)
+        )
+        background_tasks = BackgroundTasks()
+
+        await services.login_user(
+            test_db,
+            OAuth2PasswordRequestForm(username="testuser", password="testpass123"),
+            background_tasks=background_tasks,
+        )
+        assert len(background_tasks.tasks) == 1
+        await background_tasks()
+
+        await test_db.refresh(test_user)
+        new_hash = test_user.hashed_password
+        assert not old_hash.startswith("$2b$04$")
+        assert new_hash.startswith("$2b$04$")
+        assert context.needs_update(new_hash) is False
+        assert verify_password("testpass123", new_hash)
+
+
+class TestCreateUser:
+    """Test single-statement registration."""
+
+    @pytest.mark.asyncio
+    async def test_duplicate_username_leaves_session_usable(self, test_db, test_user):
+        """Test that a unique-constraint conflict maps to 400 and rolls back."""
+        from app.auth.schemas import UserCreate
+        from app.auth.services import create_user
+
+        test_user_id = test_user.id
+        with pytest.raises(HTTPException) as exc_info:
+            await create_user(test_db, UserCreate(username="testuser", password="x"))
+        assert exc_info.value.status_code == status.HTTP_400_BAD_REQUEST
+
+        other = await create_user(test_db, UserCreate(username="other", password="x"))
+        assert other.username == "other"
+        assert other.id != test_user_id
+
+
+class TestProvisionUsers:
+    """Test bulk user provisioning."""
+
+    @pytest.mark.asyncio
+    async def test_provision_reports_each_row(self, test_db, test_user):
+        """Test per-row results for created, existing, repeated and invalid rows."""
+        from concurrent.futures import ThreadPoolExecutor
+        from sqlalchemy import select
+        from app.auth.models import User
+        from app.auth.provision import provision
+
+        lines = [
+            '{"username": "alice", "password": "pw1"}',
+            '{"username": "testuser", "password": "pw2"}',
+            '{"username": "alice", "password": "pw3"}',
+            '{"username": "bob"}',
+            "",
+            '{"username": "carol", "password": "pw4"}',
+        ]
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            results = [
+                r async for r in provision(test_db, lines, executor, chunk_size=2)
+            ]
+
+        assert [(r["line"], r["status"]) for r in results] == [
+            (1, "created"),
+            (2, "exists"),
+            (3, "duplicate"),
+            (4, "invalid"),
+            (6, "created"),
+        ]
+        alice = await test_db.scalar(select(User).where(User.username == "alice"))
+        assert str(alice.id) == results[0]["id"]
+        assert verify_password("pw1", alice.hashed_password)
+
+
+class TestRevocation:
+    """Test server-side token revocation."""
+
+    def test_store_forgets_expired_revocations(self, monkeypatch):
+        """Test that entries are evicted once their token has expired."""
+        import types
+        from app.auth import revocation
+
+        clock = types.SimpleNamespace(time=lambda: 1000.0)
+        monkeypatch.setattr(revocation, "time", clock)
+        store = revocation.RevocationStore(bloom_bits=1024, bloom_hashes=3)
+        store.revoke("short", 1010.0)
+        store.revoke("long", 1100.0)
+
+        assert store.is_revoked("short") is True
+        assert store.is_revoked("never") is False
+        assert store.is_revoked(None) is False
+
+        clock.time = lambda: 1050.0
+        assert store.is_revoked("short") is False
+        assert store.is_revoked("long") is True
+        assert len(store) == 1
+
+    def test_bloom_front_rebuilt_only_when_mostly_stale(self, monkeypatch):
+        """Test that evicted jtis left in the Bloom filter are still not revoked."""
+        import types
+        from app.auth import revocation
+
+        clock = types.SimpleNamespace(time=lambda: 1000.0)
+        monkeypatch.setattr(revocation, "time", clock)
+        store = revocation.RevocationStore(bloom_bits=1024, bloom_hashes=3)
+        for i in range(3):
+            store.revoke(f"live{i}", 1100.0)
+        store.revoke("gone", 1010.0)
+        bloom = store._bloom
+
+        clock.time = lambda: 1050.0
+        assert store.is_revoked("gone") is False
+        assert store._bloom is bloom  # One stale entry against three live ones
+
+        clock.time = lambda: 1200.0
+        assert store.is_revoked("live0") is False
+        assert store._bloom is not bloom
+        assert "gone" not in store._bloom
+
+    @pytest.mark.asyncio
+    async def test_revocation_survives_restart(self, test_db, test_user_token):
+        """Test that persisted revocations are reloaded into a fresh store."""
+        from app.auth import services
+        from app.auth.revocation import RevocationStore
+
+        await services.revoke_token(test_db, test_user_token)
+        jti = services.decode_access_token(test_user_token)["jti"]
+
+        original = services.revocation_store
+        services.revocation_store = RevocationStore()
+        try:
+            assert services.revocation_store.is_revoked(jti) is False
+            await services.load_revocations(test_db)
+            assert services.revocation_store.is_revoked(jti) is True
+        finally:
+            services.revocation_store = original
+
+    @pytest.mark.asyncio
+    async def test_sync_picks_up_late_commits(self, test_db, monkeypatch):
+        """Test that a revocation stamped before the last pull but committed after it is seen."""
+        from datetime import timedelta
+        from sqlalchemy import insert
+        from app.auth import services
+        from app.auth.models import RevokedToken
+        from app.auth.revocation import RevocationStore
+
+        monkeypatch.setattr(services, "revocation_store", RevocationStore())
+        await services.load_revocations(test_db)
+        synced = services.revocation_store.watermark + services.REVOCATION_SYNC_OVERLAP
+
+        # Another worker's logout, stamped while it waited on a long write batch
+        await test_db.execute(
+            insert(RevokedToken).values(
+                jti="late",
+                revoked_at=synced - timedelta(seconds=20),
+                expires_at=synced + timedelta(minutes=30),
+            )
+        )
+        await test_db.commit()
+        await services.load_revocations(test_db)
+
+        assert services.revocation_store.is_revoked("late") is True
+
+    @pytest.mark.asyncio
+    async def test_revoked_at_comes_from_database(self, test_db, test_user_token):
+        """Test that revocations are stamped by the database clock, in UTC."""
+        from datetime import datetime, timedelta, timezone
+        from sqlalchemy import select
+        from app.auth import services
+        from app.auth.models import RevokedToken
+
+        await services.revoke_token(test_db, test_user_token)
+        revoked_at = await test_db.scalar(select(RevokedToken.revoked_at))
+
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        assert abs(now - revoked_at) < timedelta(seconds=5)
@@ -337,4 +337,150 @@ class TestDeleteClientEndpoint:
             cookies={"access_token": client_with_auth.test_token},
         )
         assert get_project_response.status_code == status.HTTP_200_OK
-        assert get_project_response.json()["client_id"] is None
\ No newline at end of file
+        assert get_project_response.json()["client_id"] is None
+
+
+class TestClientWriteQueryCounts:
+    """Test that client writes use RETURNING instead of a follow-up SELECT."""
+
+    def test_create_client_single_statement(self, client_with_auth, query_log):
+        """Test that creating a client is one INSERT ... RETURNING."""
+        cookies = {"access_token": client_with_auth.test_token}
+        client_with_auth.get("/client/all/", cookies=cookies)  # warm the auth caches
+        query_log.clear()
+
+        response = client_with_auth.post(
+            "/client/", json={"name": "Counted Corp"}, cookies=cookies
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert len(query_log) == 1
+        assert query_log[0].startswith("INSERT") and "RETURNING" in query_log[0]
+
+    def test_update_client_no_refresh(self, client_with_auth, query_log):
+        """Test that an update is one owner-scoped UPDATE ... RETURNING."""
+        cookies = {"access_token": client_with_auth.test_token}
+        client_id = client_with_auth.post(
+            "/client/", json={"name": "Counted Corp"}, cookies=cookies
+        ).json()["id"]
+        query_log.clear()
+
+        response = client_with_auth.patch(
+            f"/client/{client_id}", json={"rate": 99.0}, cookies=cookies
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["rate"] == 99.0
+        assert len(query_log) == 1
+        assert query_log[0].startswith("UPDATE") and "RETURNING" in query_log[0]
+
+    def test_delete_client_does_not_load_projects(self, client_with_auth, query_log):
+        """Test that a client's projects are detached with one bulk UPDATE."""
+        cookies = {"access_token": client_with_auth.test_token}
+        client_id = client_with_auth.post(
+            "/client/", json={"name": "Counted Corp"}, cookies=cookies
+        ).json()["id"]
+        for i in range(5):
+            client_with_auth.post(
+                "/project/",
+                json={"name": f"Project {i}", "client_id": client_id},
+                cookies=cookies,
+            )
+        query_log.clear()
+
+        response = client_with_auth.delete(f"/client/{client_id}", cookies=cookies)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [s.split()[:3] for s in query_log] == [
+            ["UPDATE", "projects", "SET"],
+            ["DELETE", "FROM", "clients"],
+        ]
+
+
+class TestClientPagination:
+    """Test keyset pagination of the client list."""
+
+    def test_cursor_walks_every_client_once(self, client_with_auth):
+        """Test that following X-Next-Cursor returns each client once, in order."""
+        cookies = {"access_token": client_with_auth.test_token}
+        created = [
+            client_with_auth.post(
+                "/client/", json={"name": f"Client {i}"}, cookies=cookies
+            ).json()["id"]
+            for i in range(5)
+        ]
+
+        seen, cursor = [], None
+        while True:
+            params = {"limit": 2, **({"cursor": cursor} if cursor else {})}
+            response = client_with_auth.get("/client/all/", params=params, cookies=cookies)
+            assert response.status_code == status.HTTP_200_OK
+            assert len(response.json()) <= 2
+            seen += [c["id"] for c in response.json()]
+            cursor = response.headers.get("X-Next-Cursor")
+            if cursor is None:
+                break
+
+        assert seen == created
+
+    def test_last_page_has_no_cursor(self, client_with_auth):
+        """Test that a page holding the remaining rows carries no next cursor."""
+        cookies = {"access_token": client_with_auth.test_token}
+        client_with_auth.post("/client/", json={"name": "Only"}, cookies=cookies)
+
+        response = client_with_auth.get(
+            "/client/all/", params={"limit": 1}, cookies=cookies
+        )
+
+        assert len(response.json()) == 1
+        assert "X-Next-Cursor" not in response.headers
+
+    def test_invalid_cursor(self, client_with_auth):
+        """Test that a malformed cursor is a 400."""
+        response = client_with_auth.get(
+            "/client/all/",
+            params={"cursor": "not-a-cursor"},
+            cookies={"access_token": client_with_auth.test_token},
+        )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_cursor_with_wrong_types(self, client_with_auth):
+        """Test that well-formed cursor JSON with the wrong shape is a 400, not a 500."""
+        import base64
+        import json
+
+        for payload in (["id", None, 5], ["id", None, ["a"]], [1, None, "ab"], {"a": 1}):
+            cursor = base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+            response = client_with_auth.get(
+                "/client/all/",
+                params={"cursor": cursor.rstrip("=")},
+                cookies={"access_token": client_with_auth.test_token},
+            )
+            assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_limit_bounds(self, client_with_auth):
+        """Test that limit must be between 1 and PAGE_SIZE_MAX."""
+        cookies = {"access_token": client_with_auth.test_token}
+        for limit in (0, 1_000_000):
+            response = client_with_auth.get(
+                "/client/all/", params={"limit": limit}, cookies=cookies
+            )
+            assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+    def test_serialize_once_pages(self, client_with_auth, monkeypatch):
+        """Test that SERIALIZE_ONCE pages carry the same clients and cursor."""
+        from app import responses
+
+        cookies = {"access_token": client_with_auth.test_token}
+        for i in range(3):
+            client_with_auth.post(
+                "/client/", json={"name": f"Client {i}", "rate": 10.5}, cookies=cookies
+            )
+
+        default = client_with_auth.get("/client/all/", params={"limit": 2}, cookies=cookies)
+        monkeypatch.setattr(responses, "SERIALIZE_ONCE", True)
+        once = client_with_auth.get("/client/all/", params={"limit": 2}, cookies=cookies)
+
+        assert once.json() == default.json()
+        assert once.headers["X-Next-Cursor"] == default.headers["X-Next-Cursor"]
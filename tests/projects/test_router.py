@@ -1,3 +1,4 @@
+import asyncio
 import pytest
 from fastapi import status
 import uuid
@@ -1110,3 +1111,525 @@ class TestDeleteTaskEndpoint:
         response = client_with_auth.delete(f"/project/task/{fake_id}")
 
         assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+class TestReferencedRows:
+    """Test writes that point at a project or client, with foreign keys enforced."""
+
+    def test_foreign_keys_enforced(self, client_with_auth):
+        """Test that the test database enforces foreign keys like every SQLITE_PROFILE."""
+        from sqlalchemy import text
+
+        async def pragma():
+            async with client_with_auth.test_engine.connect() as conn:
+                return await conn.scalar(text("PRAGMA foreign_keys"))
+
+        if client_with_auth.test_engine.dialect.name != "sqlite":
+            pytest.skip("SQLite only")
+        assert asyncio.run(pragma()) == 1
+
+    def test_create_task_unknown_project(self, client_with_auth):
+        """Test that a task for a project that doesn't exist is a 404, not a 500."""
+        response = client_with_auth.post(
+            "/project/task/",
+            json={"name": "Orphan", "project_id": str(uuid.uuid4())},
+            cookies={"access_token": client_with_auth.test_token},
+        )
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+        assert response.json()["detail"] == "Project not found"
+
+    def test_create_project_unknown_client(self, client_with_auth):
+        """Test that a project for a client that doesn't exist is a 404."""
+        response = client_with_auth.post(
+            "/project/",
+            json={"name": "Orphan", "client_id": str(uuid.uuid4())},
+            cookies={"access_token": client_with_auth.test_token},
+        )
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+        assert response.json()["detail"] == "Client not found"
+
+    def test_update_task_to_unknown_project(self, client_with_auth):
+        """Test that moving a task to a missing project is a 404 and changes nothing."""
+        cookies = {"access_token": client_with_auth.test_token}
+        project_id = client_with_auth.post(
+            "/project/", json={"name": "Home"}, cookies=cookies
+        ).json()["id"]
+        task_id = client_with_auth.post(
+            "/project/task/",
+            json={"name": "Stay", "project_id": project_id},
+            cookies=cookies,
+        ).json()["id"]
+
+        response = client_with_auth.patch(
+            f"/project/task/{task_id}",
+            json={"project_id": str(uuid.uuid4())},
+            cookies=cookies,
+        )
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+        tasks = client_with_auth.get(
+            f"/project/get/{project_id}/tasks", cookies=cookies
+        ).json()
+        assert [t["id"] for t in tasks] == [task_id]
+
+    def test_update_project_to_other_users_client(self, client_with_auth):
+        """Test that a project can't be attached to another user's client."""
+        from app.auth.models import User
+        from app.clients.models import Client
+
+        async def other_client():
+            async with client_with_auth.test_engine.begin() as conn:
+                other_id, client_id = uuid.uuid4(), uuid.uuid4()
+                await conn.execute(
+                    User.__table__.insert().values(
+                        id=other_id, username="other", hashed_password="x"
+                    )
+                )
+                await conn.execute(
+                    Client.__table__.insert().values(
+                        id=client_id, name="Theirs", user_id=other_id
+                    )
+                )
+                return client_id
+
+        client_id = asyncio.run(other_client())
+        cookies = {"access_token": client_with_auth.test_token}
+        project_id = client_with_auth.post(
+            "/project/", json={"name": "Mine"}, cookies=cookies
+        ).json()["id"]
+
+        response = client_with_auth.patch(
+            f"/project/{project_id}", json={"client_id": str(client_id)}, cookies=cookies
+        )
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+        assert response.json()["detail"] == "Client not found"
+
+    def test_null_in_required_column(self, client_with_auth):
+        """Test that an explicit null for a NOT NULL column is a plain 400."""
+        cookies = {"access_token": client_with_auth.test_token}
+        project_id = client_with_auth.post(
+            "/project/", json={"name": "Named"}, cookies=cookies
+        ).json()["id"]
+
+        responses = [
+            client_with_auth.patch(
+                f"/project/{project_id}", json={"name": None}, cookies=cookies
+            ),
+            client_with_auth.post(
+                "/project/task/", json={"name": "Loose", "project_id": None}, cookies=cookies
+            ),
+        ]
+
+        for response in responses:
+            assert response.status_code == status.HTTP_400_BAD_REQUEST
+            assert response.json()["detail"] == "Constraint violation"
+
+
+class TestProjectWriteQueryCounts:
+    """Test that project and task writes use RETURNING instead of a refresh."""
+
+    def test_create_project_and_task_one_insert(
+        self, client_with_auth, query_log
+    ):
+        """Test that a create is one INSERT ... RETURNING, after any ownership check."""
+        cookies = {"access_token": client_with_auth.test_token}
+        client_with_auth.get("/project/all/", cookies=cookies)  # warm the auth caches
+        query_log.clear()
+
+        project = client_with_auth.post(
+            "/project/", json={"name": "Counted"}, cookies=cookies
+        )
+        assert project.status_code == status.HTTP_200_OK
+        assert len(query_log) == 1
+        assert query_log[0].startswith("INSERT") and "RETURNING" in query_log[0]
+        query_log.clear()
+
+        task = client_with_auth.post(
+            "/project/task/",
+            json={"name": "Counted task", "project_id": project.json()["id"]},
+            cookies=cookies,
+        )
+        assert task.status_code == status.HTTP_200_OK
+        assert [s.split()[0] for s in query_log] == ["SELECT", "INSERT"]
+        assert "FROM projects" in query_log[0]
+        assert "RETURNING" in query_log[1]
+
+    def test_update_project_and_task_no_refresh(self, client_with_auth, query_log):
+        """Test that updates are one owner-scoped UPDATE ... RETURNING each."""
+        cookies = {"access_token": client_with_auth.test_token}
+        project_id = client_with_auth.post(
+            "/project/", json={"name": "Counted"}, cookies=cookies
+        ).json()["id"]
+        task_id = client_with_auth.post(
+            "/project/task/",
+            json={"name": "Counted task", "project_id": project_id},
+            cookies=cookies,
+        ).json()["id"]
+
+        for url, body in [
+            (f"/project/{project_id}", {"completed": True}),
+            (f"/project/task/{task_id}", {"completed": True}),
+        ]:
+            query_log.clear()
+            response = client_with_auth.patch(url, json=body, cookies=cookies)
+
+            assert response.status_code == status.HTTP_200_OK
+            assert response.json()["completed"] is True
+            assert len(query_log) == 1
+            assert query_log[0].startswith("UPDATE") and "RETURNING" in query_log[0]
+
+    def test_delete_project_does_not_load_tasks(self, client_with_auth, query_log):
+        """Test that deleting a project removes its tasks with one bulk DELETE."""
+        cookies = {"access_token": client_with_auth.test_token}
+        project_id = client_with_auth.post(
+            "/project/", json={"name": "Counted"}, cookies=cookies
+        ).json()["id"]
+        task_ids = [
+            client_with_auth.post(
+                "/project/task/",
+                json={"name": f"Task {i}", "project_id": project_id},
+                cookies=cookies,
+            ).json()["id"]
+            for i in range(5)
+        ]
+        query_log.clear()
+
+        response = client_with_auth.delete(f"/project/{project_id}", cookies=cookies)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [s.split()[:3] for s in query_log] == [
+            ["DELETE", "FROM", "tasks"],
+            ["DELETE", "FROM", "projects"],
+        ]
+        remaining = client_with_auth.get("/project/task/all/", cookies=cookies).json()
+        assert not {task["id"] for task in remaining} & set(task_ids)
+
+
+class TestTaskPagination:
+    """Test keyset pagination of the task lists."""
+
+    def test_project_tasks_paginated(self, client_with_auth):
+        """Test that a project's tasks come back page by page in creation order."""
+        cookies = {"access_token": client_with_auth.test_token}
+        project_id = client_with_auth.post(
+            "/project/", json={"name": "Paged"}, cookies=cookies
+        ).json()["id"]
+        created = [
+            client_with_auth.post(
+                "/project/task/",
+                json={"name": f"Task {i}", "project_id": project_id},
+                cookies=cookies,
+            ).json()["id"]
+            for i in range(3)
+        ]
+
+        first = client_with_auth.get(
+            f"/project/get/{project_id}/tasks", params={"limit": 2}, cookies=cookies
+        )
+        second = client_with_auth.get(
+            f"/project/get/{project_id}/tasks",
+            params={"limit": 2, "cursor": first.headers["X-Next-Cursor"]},
+            cookies=cookies,
+        )
+
+        assert [t["id"] for t in first.json() + second.json()] == created
+        assert "X-Next-Cursor" not in second.headers
+
+
+class TestListFiltersAndSort:
+    """Test filtering and sorting of the project and task lists."""
+
+    def _tasks(self, client_with_auth, deadlines):
+        cookies = {"access_token": client_with_auth.test_token}
+        project_id = client_with_auth.post(
+            "/project/", json={"name": "Sorted"}, cookies=cookies
+        ).json()["id"]
+        return project_id, [
+            client_with_auth.post(
+                "/project/task/",
+                json={
+                    "name": f"Task {i}",
+                    "project_id": project_id,
+                    "deadline": deadline,
+                    "completed": i % 2 == 0,
+                },
+                cookies=cookies,
+            ).json()
+            for i, deadline in enumerate(deadlines)
+        ]
+
+    def _walk(self, client_with_auth, url, params):
+        cookies = {"access_token": client_with_auth.test_token}
+        seen, cursor = [], None
+        while True:
+            page_params = {**params, **({"cursor": cursor} if cursor else {})}
+            response = client_with_auth.get(url, params=page_params, cookies=cookies)
+            assert response.status_code == status.HTTP_200_OK
+            seen += response.json()
+            cursor = response.headers.get("X-Next-Cursor")
+            if cursor is None:
+                return seen
+
+    def test_sort_by_deadline_across_pages(self, client_with_auth):
+        """Test deadline order in both directions, NULL deadlines last, over several pages."""
+        _, tasks = self._tasks(
+            client_with_auth,
+            [
+                "2030-03-01T00:00:00",
+                None,
+                "2030-01-01T00:00:00",
+                "2030-03-01T00:00:00",
+                None,
+                "2030-02-01T00:00:00",
+            ],
+        )
+        dated = [t for t in tasks if t["deadline"]]
+        undated = [t["id"] for t in tasks if not t["deadline"]]
+
+        ascending = self._walk(
+            client_with_auth, "/project/task/all/", {"sort": "deadline", "limit": 2}
+        )
+        descending = self._walk(
+            client_with_auth, "/project/task/all/", {"sort": "-deadline", "limit": 2}
+        )
+
+        by_deadline = sorted(dated, key=lambda t: (t["deadline"], t["id"]))
+        assert [t["id"] for t in ascending] == [t["id"] for t in by_deadline] + undated
+        assert [t["id"] for t in descending] == [
+            t["id"] for t in reversed(by_deadline)
+        ] + undated[::-1]
+
+    def test_filter_tasks(self, client_with_auth):
+        """Test the completed, project_id and deadline-window filters."""
+        cookies = {"access_token": client_with_auth.test_token}
+        project_id, tasks = self._tasks(
+            client_with_auth,
+            ["2030-01-01T00:00:00", "2030-02-01T00:00:00", "2030-03-01T00:00:00"],
+        )
+        client_with_auth.post("/project/", json={"name": "Other"}, cookies=cookies)
+
+        def ids(**params):
+            response = client_with_auth.get(
+                "/project/task/all/", params=params, cookies=cookies
+            )
+            assert response.status_code == status.HTTP_200_OK
+            return {t["id"] for t in response.json()}
+
+        assert ids(completed=True) == {tasks[0]["id"], tasks[2]["id"]}
+        assert ids(project_id=project_id) == {t["id"] for t in tasks}
+        assert ids(project_id=str(uuid.uuid4())) == set()
+        assert ids(
+            deadline_after="2030-01-15T00:00:00", deadline_before="2030-03-01T00:00:00"
+        ) == {tasks[1]["id"]}
+
+    def test_filter_projects(self, client_with_auth):
+        """Test the project list filters."""
+        cookies = {"access_token": client_with_auth.test_token}
+        client_id = client_with_auth.post(
+            "/client/", json={"name": "Acme"}, cookies=cookies
+        ).json()["id"]
+        done = client_with_auth.post(
+            "/project/",
+            json={"name": "Done", "completed": True, "client_id": client_id},
+            cookies=cookies,
+        ).json()["id"]
+        client_with_auth.post("/project/", json={"name": "Open"}, cookies=cookies)
+
+        response = client_with_auth.get(
+            "/project/all/",
+            params={"completed": True, "client_id": client_id},
+            cookies=cookies,
+        )
+
+        assert [p["id"] for p in response.json()] == [done]
+
+    def test_unknown_sort_rejected(self, client_with_auth):
+        """Test that only whitelisted columns can be sorted on."""
+        response = client_with_auth.get(
+            "/project/task/all/",
+            params={"sort": "description"},
+            cookies={"access_token": client_with_auth.test_token},
+        )
+
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+    def test_cursor_bound_to_its_sort(self, client_with_auth):
+        """Test that a cursor from one sort order is refused under another."""
+        cookies = {"access_token": client_with_auth.test_token}
+        self._tasks(client_with_auth, [None, None])
+        cursor = client_with_auth.get(
+            "/project/task/all/", params={"limit": 1}, cookies=cookies
+        ).headers["X-Next-Cursor"]
+
+        response = client_with_auth.get(
+            "/project/task/all/",
+            params={"limit": 1, "sort": "deadline", "cursor": cursor},
+            cookies=cookies,
+        )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+class TestSparseFieldsets:
+    """Test ?fields= projections on the project and task endpoints."""
+
+    def test_list_returns_only_requested_fields(self, client_with_auth, query_log):
+        """Test that both the SELECT and the response are narrowed."""
+        cookies = {"access_token": client_with_auth.test_token}
+        for i in range(3):
+            client_with_auth.post(
+                "/project/",
+                json={"name": f"Project {i}", "description": "x" * 1000},
+                cookies=cookies,
+            )
+        query_log.clear()
+
+        response = client_with_auth.get(
+            "/project/all/", params={"fields": "name,deadline"}, cookies=cookies
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [set(p) for p in response.json()] == [{"id", "name", "deadline"}] * 3
+        select = next(s for s in query_log if "FROM projects" in s)
+        assert "description" not in select
+
+    def test_sparse_page_keeps_cursor(self, client_with_auth):
+        """Test that sparse pages still paginate, including by a sort column not returned."""
+        cookies = {"access_token": client_with_auth.test_token}
+        project_id = client_with_auth.post(
+            "/project/", json={"name": "Sparse"}, cookies=cookies
+        ).json()["id"]
+        for day in (3, 1, 2):
+            client_with_auth.post(
+                "/project/task/",
+                json={
+                    "name": f"Day {day}",
+                    "project_id": project_id,
+                    "deadline": f"2030-01-0{day}T00:00:00",
+                },
+                cookies=cookies,
+            )
+
+        params = {"fields": "name", "sort": "deadline", "limit": 2}
+        first = client_with_auth.get("/project/task/all/", params=params, cookies=cookies)
+        second = client_with_auth.get(
+            "/project/task/all/",
+            params={**params, "cursor": first.headers["X-Next-Cursor"]},
+            cookies=cookies,
+        )
+
+        assert [t["name"] for t in first.json() + second.json()] == [
+            "Day 1",
+            "Day 2",
+            "Day 3",
+        ]
+        assert set(first.json()[0]) == {"id", "name"}
+
+    def test_get_project_fields(self, client_with_auth):
+        """Test a sparse single-project read."""
+        cookies = {"access_token": client_with_auth.test_token}
+        project_id = client_with_auth.post(
+            "/project/", json={"name": "One"}, cookies=cookies
+        ).json()["id"]
+
+        response = client_with_auth.get(
+            f"/project/get/{project_id}", params={"fields": "name"}, cookies=cookies
+        )
+
+        assert response.json() == {"id": project_id, "name": "One"}
+
+    def test_unknown_field_rejected(self, client_with_auth):
+        """Test that only fields of the read schema can be requested."""
+        response = client_with_auth.get(
+            "/project/task/all/",
+            params={"fields": "name,hashed_password"},
+            cookies={"access_token": client_with_auth.test_token},
+        )
+
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+    def test_sparse_responses_renew_token(self, client_with_auth, aging_token):
+        """Test that ?fields= responses still carry the renewed access_token cookie."""
+        cookies = {"access_token": aging_token()}
+        project_id = client_with_auth.post(
+            "/project/", json={"name": "Renewed"}, cookies=cookies
+        ).json()["id"]
+
+        for url in ("/project/all/", f"/project/get/{project_id}"):
+            response = client_with_auth.get(url, params={"fields": "name"}, cookies=cookies)
+            assert response.status_code == status.HTTP_200_OK
+            assert "access_token" in response.cookies
+            assert response.headers["content-type"] == "application/json"
+
+    def test_sparse_get_missing_project_is_404(self, client_with_auth):
+        """Test that a narrowed read still maps a miss to 404."""
+        response = client_with_auth.get(
+            f"/project/get/{uuid.uuid4()}",
+            params={"fields": "name"},
+            cookies={"access_token": client_with_auth.test_token},
+        )
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+class TestSerializeOnce:
+    """Test list endpoints with SERIALIZE_ONCE on."""
+
+    def test_task_list_matches_response_model_path(self, client_with_auth, monkeypatch):
+        """Test that serializing in one pass gives the same JSON and cursor header."""
+        from app import responses
+
+        cookies = {"access_token": client_with_auth.test_token}
+        project_id = client_with_auth.post(
+            "/project/", json={"name": "Serialized"}, cookies=cookies
+        ).json()["id"]
+        for day in (1, 2, 3):
+            client_with_auth.post(
+                "/project/task/",
+                json={
+                    "name": f"Day {day}",
+                    "project_id": project_id,
+                    "deadline": f"2030-01-0{day}T12:30:00",
+                    "hours_worked": day * 1.5,
+                },
+                cookies=cookies,
+            )
+        params = {"sort": "-deadline", "limit": 2}
+
+        default = client_with_auth.get("/project/task/all/", params=params, cookies=cookies)
+        monkeypatch.setattr(responses, "SERIALIZE_ONCE", True)
+        once = client_with_auth.get("/project/task/all/", params=params, cookies=cookies)
+
+        assert once.status_code == status.HTTP_200_OK
+        assert once.headers["content-type"] == "application/json"
+        assert once.json() == default.json()
+        assert once.headers["X-Next-Cursor"] == default.headers["X-Next-Cursor"]
+
+    def test_list_renews_token(self, client_with_auth, monkeypatch, aging_token):
+        """Test that one-pass responses still carry the renewed access_token cookie."""
+        from app import responses
+
+        monkeypatch.setattr(responses, "SERIALIZE_ONCE", True)
+        cookies = {"access_token": aging_token()}
+
+        for url in ("/project/all/", "/project/task/all/", "/client/all/"):
+            response = client_with_auth.get(url, cookies=cookies)
+            assert response.status_code == status.HTTP_200_OK
+            assert "access_token" in response.cookies
+
+    def test_fields_still_apply(self, client_with_auth, monkeypatch):
+        """Test that ?fields= narrows the response with SERIALIZE_ONCE on too."""
+        from app import responses
+
+        monkeypatch.setattr(responses, "SERIALIZE_ONCE", True)
+        cookies = {"access_token": client_with_auth.test_token}
+        client_with_auth.post("/project/", json={"name": "Narrow"}, cookies=cookies)
+
+        response = client_with_auth.get(
+            "/project/all/", params={"fields": "name"}, cookies=cookies
+        )
+
+        assert [set(p) for p in response.json()] == [{"id", "name"}]
@@ -0,0 +1,174 @@
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+from app.database import (
+    SQLITE_PROFILES,
+    apply_sqlite_pragmas,
+    database_url,
+    postgres_engine,
+    sqlite_pragmas,
+)
+
+
+class TestSqlitePragmas:
+    """Test the SQLite connection tuning hook."""
+
+    @pytest.mark.asyncio
+    async def test_profile_applied_on_connect(self, tmp_path):
+        """Test that every new connection runs the profile's PRAGMAs."""
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'p.db'}")
+        apply_sqlite_pragmas(engine, SQLITE_PROFILES["throughput"])
+        try:
+            async with engine.connect() as conn:
+                journal_mode = await conn.scalar(text("PRAGMA journal_mode"))
+                synchronous = await conn.scalar(text("PRAGMA synchronous"))
+                foreign_keys = await conn.scalar(text("PRAGMA foreign_keys"))
+                mmap_size = await conn.scalar(text("PRAGMA mmap_size"))
+        finally:
+            await engine.dispose()
+
+        assert journal_mode == "wal"
+        assert synchronous == 1  # NORMAL
+        assert foreign_keys == 1
+        assert mmap_size == SQLITE_PROFILES["throughput"]["mmap_size"]
+
+    def test_unknown_profile_rejected(self):
+        """Test that a typo in SQLITE_PROFILE fails loudly."""
+        with pytest.raises(ValueError):
+            sqlite_pragmas("fastest")
+
+    def test_unsafe_value_rejected(self):
+        """Test that PRAGMA values cannot smuggle extra SQL."""
+        engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+        with pytest.raises(ValueError):
+            apply_sqlite_pragmas(engine, {"cache_size": "1; DROP TABLE users"})
+
+
+class TestDatabaseUrl:
+    """Test how DATABASE_URL picks the backend."""
+
+    def test_bare_path_is_sqlite(self):
+        """Test that a plain path keeps meaning a SQLite file."""
+        url = database_url("/var/lib/app/db.sqlite")
+        assert url.drivername == "sqlite+aiosqlite"
+        assert url.database == "/var/lib/app/db.sqlite"
+
+    @pytest.mark.parametrize("scheme", ["postgres", "postgresql"])
+    def test_postgres_uses_asyncpg(self, scheme):
+        """Test that plain Postgres URLs get the async driver."""
+        url = database_url(f"{scheme}://app:secret@db:5432/tracker")
+        assert url.drivername == "postgresql+asyncpg"
+        assert (url.host, url.database) == ("db", "tracker")
+
+    @pytest.mark.asyncio
+    async def test_postgres_engine_is_pooled(self):
+        """Test that the Postgres engine takes its pool settings from config."""
+        engine = postgres_engine(database_url("postgresql://app@db/tracker"))
+        try:
+            assert engine.pool.size() == 10
+            assert engine.pool._recycle == 1800
+        finally:
+            await engine.dispose()
+
+
+class TestReadWriteTopology:
+    """Test the single-writer / multi-reader engine setup."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_writes_queue_on_single_writer(self, tmp_path):
+        """Test that overlapping write transactions serialize instead of failing."""
+        import asyncio
+        from app.database import use_immediate_transactions
+
+        url = f"sqlite+aiosqlite:///{tmp_path / 'w.db'}"
+        writer = create_async_engine(url, pool_size=1, max_overflow=0)
+        apply_sqlite_pragmas(writer, SQLITE_PROFILES["balanced"])
+        use_immediate_transactions(writer)
+        try:
+            async with writer.begin() as conn:
+                await conn.execute(text("CREATE TABLE counter (n INTEGER)"))
+                await conn.execute(text("INSERT INTO counter VALUES (0)"))
+
+            async def increment():
+                async with writer.begin() as conn:
+                    n = await conn.scalar(text("SELECT n FROM counter"))
+                    await asyncio.sleep(0)
+                    await conn.execute(text("UPDATE counter SET n = :n"), {"n": n + 1})
+
+            await asyncio.gather(*(increment() for _ in range(20)))
+
+            async with writer.connect() as conn:
+                assert await conn.scalar(text("SELECT n FROM counter")) == 20
+        finally:
+            await writer.dispose()
+
+    @pytest.mark.asyncio
+    async def test_read_connections_reject_writes(self, tmp_path):
+        """Test that query_only read connections cannot modify the database."""
+        from sqlalchemy.exc import OperationalError
+
+        url = f"sqlite+aiosqlite:///{tmp_path / 'r.db'}"
+        writer = create_async_engine(url)
+        reader = create_async_engine(url)
+        apply_sqlite_pragmas(reader, {"query_only": "ON"})
+        try:
+            async with writer.begin() as conn:
+                await conn.execute(text("CREATE TABLE t (n INTEGER)"))
+            async with reader.connect() as conn:
+                assert await conn.scalar(text("SELECT count(*) FROM t")) == 0
+                with pytest.raises(OperationalError):
+                    await conn.execute(text("INSERT INTO t VALUES (1)"))
+        finally:
+            await writer.dispose()
+            await reader.dispose()
+
+
+class TestGroupCommit:
+    """Test coalescing concurrent writes into one transaction."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_ops_share_one_commit(self, tmp_path):
+        """Test that a batch commits once and a failing op only fails its caller."""
+        import asyncio
+        from sqlalchemy import event
+        from sqlalchemy.ext.asyncio import async_sessionmaker
+        from app.database import GroupCommitter, use_immediate_transactions
+
+        url = f"sqlite+aiosqlite:///{tmp_path / 'g.db'}"
+        writer = create_async_engine(url, pool_size=1, max_overflow=0)
+        use_immediate_transactions(writer)
+        commits = []
+        event.listen(writer.sync_engine, "commit", lambda conn: commits.append(1))
+        try:
+            async with writer.begin() as conn:
+                await conn.execute(text("CREATE TABLE t (n INTEGER UNIQUE)"))
+            commits.clear()
+
+            committer = GroupCommitter(
+                async_sessionmaker(bind=writer, expire_on_commit=False),
+                window=0.01,
+                max_batch=100,
+            )
+
+            def insert(n):
+                async def op(session):
+                    await session.execute(text("INSERT INTO t VALUES (:n)"), {"n": n})
+                    return n
+
+                return op
+
+            # 3 is inserted twice, so exactly one of those two callers fails
+            results = await asyncio.gather(
+                *(committer.run(insert(n)) for n in [1, 2, 3, 3, 4]),
+                return_exceptions=True,
+            )
+
+            assert results[:3] == [1, 2, 3]
+            assert isinstance(results[3], Exception)
+            assert results[4] == 4
+            assert len(commits) == 1
+            async with writer.connect() as conn:
+                rows = (await conn.execute(text("SELECT n FROM t ORDER BY n"))).scalars()
+                assert list(rows) == [1, 2, 3, 4]
+        finally:
+            await writer.dispose()
@@ -0,0 +1,30 @@
+import time
+import uuid
+from app.ids import new_id, uuid7
+
+
+class TestUuid7:
+    """Test the time-ordered id generator."""
+
+    def test_version_and_variant(self):
+        """Test that generated ids are RFC 9562 version 7 UUIDs."""
+        value = uuid7()
+        assert value.version == 7
+        assert value.variant == uuid.RFC_4122
+
+    def test_embeds_current_time(self):
+        """Test that the leading 48 bits are the Unix time in milliseconds."""
+        before = time.time_ns() // 1_000_000
+        value = uuid7()
+        after = time.time_ns() // 1_000_000
+        assert before <= value.int >> 80 <= after + 1
+
+    def test_strictly_increasing(self):
+        """Test that ids from one process sort in creation order."""
+        ids = [uuid7() for _ in range(10_000)]
+        assert ids == sorted(ids)
+        assert len(set(ids)) == len(ids)
+
+    def test_new_id_defaults_to_uuid7(self):
+        """Test that models get time-ordered keys by default."""
+        assert new_id().version == 7
@@ -0,0 +1,183 @@
+import uuid
+import pytest
+import pytest_asyncio
+from sqlalchemy import bindparam, inspect, select, text
+from sqlalchemy.ext.asyncio import create_async_engine
+from app.clients.models import Client
+from app.migrations import MIGRATIONS, run_migrations
+from app.types import GUID
+
+
+EXPECTED_INDEXES = {
+    "clients": {"ix_clients_user_id_id"},
+    "projects": {
+        "ix_projects_client_id",
+        "ix_projects_user_id_id",
+        "ix_projects_user_id_client_id_id",
+        "ix_projects_user_id_deadline_id",
+    },
+    "tasks": {
+        "ix_tasks_project_id",
+        "ix_tasks_user_id_id",
+        "ix_tasks_user_id_project_id_id",
+        "ix_tasks_user_id_deadline_id",
+    },
+}
+
+# Schema as the pre-migration create_all left it: tables, no FK indexes
+LEGACY_SCHEMA = [
+    """CREATE TABLE users (
+        id CHAR(32) PRIMARY KEY, username VARCHAR UNIQUE, hashed_password VARCHAR
+    )""",
+    """CREATE TABLE clients (
+        id CHAR(32) PRIMARY KEY, name VARCHAR NOT NULL, notes VARCHAR, rate FLOAT,
+        user_id CHAR(32) NOT NULL REFERENCES users (id)
+    )""",
+    """CREATE TABLE projects (
+        id CHAR(32) PRIMARY KEY, name VARCHAR NOT NULL, description VARCHAR,
+        completed BOOLEAN NOT NULL, completed_on DATETIME, rate FLOAT,
+        hours_worked FLOAT NOT NULL, use_client_rate BOOLEAN NOT NULL,
+        use_task_hours BOOLEAN NOT NULL, deadline DATETIME,
+        client_id CHAR(32) REFERENCES clients (id),
+        user_id CHAR(32) NOT NULL REFERENCES users (id)
+    )""",
+    """CREATE TABLE tasks (
+        id CHAR(32) PRIMARY KEY, name VARCHAR NOT NULL, description VARCHAR,
+        completed BOOLEAN NOT NULL, completed_on DATETIME,
+        hours_worked FLOAT NOT NULL, deadline DATETIME,
+        project_id CHAR(32) NOT NULL REFERENCES projects (id),
+        user_id CHAR(32) NOT NULL REFERENCES users (id)
+    )""",
+]
+
+
+def _index_names(conn, table):
+    return {index["name"] for index in inspect(conn).get_indexes(table)}
+
+
+@pytest_asyncio.fixture
+async def engine():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    yield engine
+    await engine.dispose()
+
+
+class TestRunMigrations:
+    """Test the versioned migration runner."""
+
+    @pytest.mark.asyncio
+    async def test_fresh_database_gets_full_schema(self, engine):
+        """Test that a new database ends up with every table and index."""
+        async with engine.begin() as conn:
+            applied = await conn.run_sync(run_migrations)
+            assert applied == [m.version for m in MIGRATIONS]
+            for table, expected in EXPECTED_INDEXES.items():
+                assert expected <= await conn.run_sync(_index_names, table)
+
+    @pytest.mark.asyncio
+    async def test_rerun_is_a_no_op(self, engine):
+        """Test that already-applied migrations are skipped."""
+        async with engine.begin() as conn:
+            await conn.run_sync(run_migrations)
+            assert await conn.run_sync(run_migrations) == []
+
+    @pytest.mark.asyncio
+    async def test_existing_database_gets_indexes(self, engine):
+        """Test that a database created before migrations is upgraded in place."""
+        async with engine.begin() as conn:
+            for statement in LEGACY_SCHEMA:
+                await conn.execute(text(statement))
+
+            await conn.run_sync(run_migrations)
+
+            for table, expected in EXPECTED_INDEXES.items():
+                assert expected <= await conn.run_sync(_index_names, table)
+
+    @pytest.mark.asyncio
+    async def test_superseded_indexes_dropped(self, engine):
+        """Test that indexes replaced by the keyset indexes are removed."""
+        async with engine.begin() as conn:
+            for statement in LEGACY_SCHEMA:
+                await conn.execute(text(statement))
+            await conn.execute(text("CREATE INDEX ix_clients_user_id ON clients (user_id)"))
+            await conn.execute(
+                text("CREATE INDEX ix_tasks_user_id_project_id ON tasks (user_id, project_id)")
+            )
+
+            await conn.run_sync(run_migrations)
+
+            assert "ix_clients_user_id" not in await conn.run_sync(_index_names, "clients")
+            assert "ix_tasks_user_id_project_id" not in await conn.run_sync(
+                _index_names, "tasks"
+            )
+
+    @pytest.mark.asyncio
+    async def test_hex_uuids_become_blobs(self, engine):
+        """Test that text UUID keys are rewritten as 16-byte blobs, FKs intact."""
+        user_id, client_id = uuid.uuid4(), uuid.uuid4()
+        async with engine.begin() as conn:
+            await conn.execute(text("PRAGMA foreign_keys = ON"))
+            for statement in LEGACY_SCHEMA:
+                await conn.execute(text(statement))
+            await conn.execute(
+                text("INSERT INTO users VALUES (:id, 'alice', 'x')"),
+                {"id": user_id.hex},
+            )
+            await conn.execute(
+                text("INSERT INTO clients VALUES (:id, 'acme', NULL, NULL, :user_id)"),
+                {"id": client_id.hex, "user_id": user_id.hex},
+            )
+
+            await conn.run_sync(run_migrations)
+
+            kinds = await conn.execute(
+                text("SELECT typeof(id), typeof(user_id), length(user_id) FROM clients")
+            )
+            assert kinds.one() == ("blob", "blob", 16)
+            assert (await conn.execute(text("PRAGMA foreign_key_check"))).all() == []
+            assert await conn.scalar(select(Client.user_id)) == user_id
+
+    @pytest.mark.asyncio
+    async def test_hex_uuids_rewritten_in_batches(self, engine, monkeypatch):
+        """Test that tables larger than one batch are fully rewritten."""
+        from app import migrations
+
+        monkeypatch.setattr(migrations, "UUID_REWRITE_BATCH", 2)
+        user_id, client_ids = uuid.uuid4(), [uuid.uuid4() for _ in range(5)]
+        async with engine.begin() as conn:
+            for statement in LEGACY_SCHEMA:
+                await conn.execute(text(statement))
+            await conn.execute(
+                text("INSERT INTO users VALUES (:id, 'alice', 'x')"),
+                {"id": user_id.hex},
+            )
+            await conn.execute(
+                text("INSERT INTO clients VALUES (:id, 'acme', NULL, NULL, :user_id)"),
+                [{"id": c.hex, "user_id": user_id.hex} for c in client_ids],
+            )
+
+            await conn.run_sync(run_migrations)
+
+            kinds = await conn.execute(text("SELECT DISTINCT typeof(id) FROM clients"))
+            assert kinds.scalars().all() == ["blob"]
+            stored = (await conn.execute(select(Client.id))).scalars().all()
+            assert sorted(stored) == sorted(client_ids)
+
+    @pytest.mark.asyncio
+    async def test_keyset_pages_need_no_sort(self, engine):
+        """Test that a page of a user's tasks is an index range scan, not a sort."""
+        async with engine.begin() as conn:
+            await conn.run_sync(run_migrations)
+            plan = await conn.execute(
+                text(
+                    "EXPLAIN QUERY PLAN SELECT * FROM tasks"
+                    " WHERE user_id = :user_id AND id > :after ORDER BY id LIMIT 100"
+                ).bindparams(
+                    bindparam("user_id", type_=GUID()), bindparam("after", type_=GUID())
+                ),
+                {"user_id": uuid.uuid4(), "after": uuid.uuid4()},
+            )
+            details = " ".join(row[3] for row in plan)
+
+        assert "ix_tasks_user_id_id" in details
+        assert "TEMP B-TREE" not in details
@@ -0,0 +1,114 @@
+import uuid
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import delete, select
+from app.auth.models import User
+from app.clients.models import Client
+from app.projects.models import Project, Task
+from app.pagination import PageParams
+from app.repository import ScopedRepository
+
+projects = ScopedRepository(Project, not_found="Project not found")
+
+
+@pytest.fixture
+def other_user_project(test_db):
+    async def make():
+        other = User(username="other", hashed_password="x")
+        test_db.add(other)
+        await test_db.flush()
+        project = Project(name="Theirs", user_id=other.id)
+        test_db.add(project)
+        await test_db.flush()
+        test_db.add(Task(name="Their task", project_id=project.id, user_id=other.id))
+        await test_db.commit()
+        project_id = project.id
+        test_db.expunge_all()
+        return project_id
+
+    return make
+
+
+class TestScopedRepository:
+    """Test the owner-scoped data access layer."""
+
+    @pytest.mark.asyncio
+    async def test_get_other_users_row_is_404_and_never_loaded(
+        self, test_db, test_user, other_user_project
+    ):
+        """Test that a foreign row is filtered out in SQL, not after loading."""
+        project_id = await other_user_project()
+
+        with pytest.raises(HTTPException) as exc_info:
+            await projects.get(test_db, project_id, test_user.id)
+
+        assert exc_info.value.status_code == 404
+        assert exc_info.value.detail == "Project not found"
+        assert not any(isinstance(obj, Project) for obj in test_db.identity_map.values())
+
+    @pytest.mark.asyncio
+    async def test_page_items_are_dicts_outside_identity_map(self, test_db, test_user):
+        """Test that list pages come back as column dicts without hydrating entities."""
+        test_db.add_all(
+            [Project(name=f"Project {i}", user_id=test_user.id) for i in range(3)]
+        )
+        await test_db.commit()
+        test_db.expunge_all()
+
+        page = await projects.page(test_db, test_user.id, PageParams(limit=2))
+
+        assert [type(item) for item in page.items] == [dict, dict]
+        assert set(page.items[0]) == set(Project.__table__.columns.keys())
+        assert page.next_cursor is not None
+        assert not any(isinstance(obj, Project) for obj in test_db.identity_map.values())
+
+    @pytest.mark.asyncio
+    async def test_update_scoped_to_owner(self, test_db, test_user, other_user_project):
+        """Test that updating another user's row changes nothing."""
+        project_id = await other_user_project()
+
+        with pytest.raises(HTTPException):
+            await projects.update(test_db, project_id, test_user.id, {"name": "Mine"})
+
+        name = await test_db.scalar(select(Project.name).where(Project.id == project_id))
+        assert name == "Theirs"
+
+    @pytest.mark.asyncio
+    async def test_delete_skips_dependents_when_not_owner(
+        self, test_db, test_user, other_user_project
+    ):
+        """Test that ``before`` statements scoped with owned_ids are no-ops for a foreign row."""
+        project_id = await other_user_project()
+        delete_tasks = delete(Task).where(
+            Task.project_id.in_(projects.owned_ids(project_id, test_user.id))
+        )
+
+        with pytest.raises(HTTPException):
+            await projects.delete(test_db, project_id, test_user.id, before=[delete_tasks])
+
+        assert await test_db.scalar(select(Task.id).where(Task.project_id == project_id))
+
+    @pytest.mark.asyncio
+    async def test_delete_returns_deleted_row(self, test_db, test_user):
+        """Test that the owner gets the deleted row back from DELETE ... RETURNING."""
+        clients = ScopedRepository(Client, not_found="Client not found")
+        client = Client(name="Acme", user_id=test_user.id)
+        test_db.add(client)
+        await test_db.commit()
+
+        deleted = await clients.delete(test_db, client.id, test_user.id)
+
+        assert deleted.name == "Acme"
+        assert await test_db.get(Client, client.id) is None
+
+    @pytest.mark.asyncio
+    async def test_constraint_violation_is_400(self, test_db, test_user):
+        """Test that a foreign key failure that slips past the reference checks is a 400."""
+        unchecked = ScopedRepository(Task, not_found="Task not found")
+
+        with pytest.raises(HTTPException) as exc_info:
+            await unchecked.create(
+                test_db, test_user.id, {"name": "Orphan", "project_id": uuid.uuid4()}
+            )
+
+        assert exc_info.value.status_code == 400
@@ -0,0 +1,37 @@
+import uuid
+import pytest
+from sqlalchemy import Column, MetaData, Table, insert, select, text
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import create_async_engine
+from app.types import GUID
+
+
+class TestGUID:
+    """Test the compact UUID column type."""
+
+    @pytest.mark.asyncio
+    async def test_sqlite_round_trip_as_16_byte_blob(self):
+        """Test that UUIDs are stored as raw bytes on SQLite and read back as UUIDs."""
+        table = Table("t", MetaData(), Column("id", GUID(), primary_key=True))
+        value = uuid.uuid4()
+        engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+        async with engine.begin() as conn:
+            await conn.run_sync(table.metadata.create_all)
+            await conn.execute(insert(table).values(id=value))
+            assert await conn.scalar(select(table.c.id).where(table.c.id == value)) == value
+            stored = await conn.scalar(text("SELECT id FROM t"))
+            assert stored == value.bytes
+        await engine.dispose()
+
+    def test_accepts_string_values(self):
+        """Test that a UUID given as a string is bound as bytes."""
+        value = uuid.uuid4()
+        bound = GUID().process_bind_param(str(value), sqlite.dialect())
+        assert bound == value.bytes
+
+    def test_native_uuid_on_postgres(self):
+        """Test that Postgres keeps its native uuid column type."""
+        dialect = postgresql.dialect()
+        assert isinstance(GUID().load_dialect_impl(dialect), postgresql.UUID)
+        value = uuid.uuid4()
+        assert GUID().process_bind_param(value, dialect) == value